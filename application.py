@@ -1,5 +1,5 @@
 from loader import config
-from utils import Progress
+from utils import Progress, KeyStore
 
 from console import Console
 from core.bot.base import Bot
@@ -18,4 +18,11 @@ class ApplicationManager:
             if config.module == "launch_sender":
                 await Bot().process_bridges()
 
+            elif config.module == "resume_sender":
+                await Bot().process_bridges(resume=True)
+
+            elif config.module == "import_key_store":
+                # Picked up by the config loader on the next start
+                KeyStore.import_text("config/data/wallets.txt", "config/data/wallets.keys")
+
             input("\nPress Enter to continue...")
@@ -0,0 +1,116 @@
+"""Memory, start latency and snapshot age of Bot.run_bridges, whole-file scan vs chunked scan
+
+Runs the real run_bridges path (balance scan, pre-flight, delay scheduler, worker pool) with the
+RPC batches and the bridge itself replaced by sleeps. The whole-file mode scans every wallet in
+one chunk before the first one starts, like the bot did before chunked scanning.
+
+Run from the repository root:
+    python -m benchmarks.run_bridges --wallets 10000 100000 --workers 20
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from loguru import logger
+
+from core.bot.base import Bot
+from core.web3.multicall import BalanceScanner
+from core.web3.preflight import PreflightScanner, WalletSnapshot
+from loader import config
+
+
+RPC_LATENCY = 0.02
+
+
+async def fake_gas_price(self) -> int:
+    await asyncio.sleep(RPC_LATENCY)
+    return 10 ** 9
+
+
+async def fake_scan_chunk(self, addresses: list[str]) -> dict[str, int]:
+    async with self.semaphore:
+        await asyncio.sleep(RPC_LATENCY)
+    return {address: 10 ** 18 for address in addresses}
+
+
+async def fake_chain_values(self) -> tuple[int, int]:
+    await asyncio.sleep(RPC_LATENCY)
+    return 10 ** 9, 56
+
+
+async def fake_fetch_chunk(self, addresses: list[str], gas_price: int, chain_id: int) -> dict[str, WalletSnapshot]:
+    async with self.semaphore:
+        await asyncio.sleep(RPC_LATENCY)
+    return {
+        address: WalletSnapshot(address, 10 ** 18, 0, gas_price, chain_id, max_age=self.max_age)
+        for address in addresses
+    }
+
+
+class BenchBot(Bot):
+    def __init__(self, addresses: list[str]):
+        super().__init__()
+        self.addresses = addresses
+        self.started = time.perf_counter()
+        self.first_start = None
+        self.snapshot_age = 0.0
+
+    async def resolve_addresses(self) -> list[str]:
+        return self.addresses
+
+    async def process_wallet(self, job: tuple[int, str, str, WalletSnapshot | None]) -> None:
+        if self.first_start is None:
+            self.first_start = time.perf_counter() - self.started
+        snapshot = job[3]
+        if snapshot:
+            self.snapshot_age = max(self.snapshot_age, time.monotonic() - snapshot.fetched_at)
+        await asyncio.sleep(0.001)
+
+
+def measure(name: str, count: int, chunk: int) -> None:
+    config.web3_settings.balance_scan.batch_size = chunk
+    config.wallet_private_keys = [f"{i + 1:064x}" for i in range(count)]
+    bot = BenchBot([f"0x{i + 1:040x}" for i in range(count)])
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    bot.started = started
+    asyncio.run(bot.run_bridges())
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<10} | wallets: {count:>7} | peak memory: {peak / 1024 / 1024:8.2f} MiB "
+        f"| first wallet after: {bot.first_start:6.2f}s | max snapshot age: {bot.snapshot_age:6.2f}s "
+        f"| elapsed: {elapsed:7.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wallets", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--chunk", type=int, default=config.web3_settings.balance_scan.batch_size)
+    args = parser.parse_args()
+
+    logger.remove()
+    BalanceScanner.gas_price = fake_gas_price
+    BalanceScanner._scan_chunk = fake_scan_chunk
+    PreflightScanner._fetch_chain_values = fake_chain_values
+    PreflightScanner._fetch_chunk = fake_fetch_chunk
+
+    config.concurrency_settings.max = args.workers
+    config.attempts_and_delay_settings.delay_before_start.min = 0
+    config.attempts_and_delay_settings.delay_before_start.max = 0
+    config.web3_settings.balance_scan.enabled = True
+    config.web3_settings.preflight.enabled = True
+
+    for count in args.wallets:
+        measure("whole file", count, count)
+        measure("chunked", count, args.chunk)
+
+
+if __name__ == "__main__":
+    main()
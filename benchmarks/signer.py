@@ -0,0 +1,85 @@
+"""Signatures per second and event loop lag, inline signing vs the process-pool signer service
+
+Run from the repository root:
+    python -m benchmarks.signer --transactions 2000 --workers 4
+"""
+import argparse
+import asyncio
+import time
+
+from eth_account import Account
+
+from core.web3.signer import SignerService
+
+
+def make_jobs(count: int) -> list[tuple[str, dict]]:
+    jobs = []
+    for i in range(count):
+        private_key = f"0x{i + 1:064x}"
+        jobs.append((private_key, {
+            "chainId": 56,
+            "to": "0x391E7C679d29bD940d63be94AD22A25d25b5A604",
+            "value": 10 ** 13,
+            "gas": 100000,
+            "gasPrice": 10 ** 9,
+            "nonce": 0,
+            "data": "0x01003a",
+        }))
+    return jobs
+
+
+async def watch_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def sign_inline(jobs: list[tuple[str, dict]]) -> None:
+    async def sign(private_key: str, transaction: dict):
+        await asyncio.sleep(0)
+        return Account.sign_transaction(transaction, private_key)
+
+    await asyncio.gather(*(sign(private_key, transaction) for private_key, transaction in jobs))
+
+
+async def sign_pooled(jobs: list[tuple[str, dict]], signer: SignerService) -> None:
+    await asyncio.gather(*(signer.sign(private_key, transaction) for private_key, transaction in jobs))
+
+
+async def measure(name: str, coroutine, count: int) -> None:
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_lag(stop))
+    started = time.perf_counter()
+    await coroutine
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lag = await watcher
+
+    print(f"{name:<8} | transactions: {count:>6} | {count / elapsed:8.0f} signatures/s | worst loop lag: {lag * 1000:8.1f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.transactions)
+    signer = SignerService(workers=args.workers, batch_size=args.batch_size)
+    await signer.start()
+    # Warm the worker processes up so their start-up cost is not measured
+    await signer.derive_addresses([private_key for private_key, _ in jobs[:signer.workers]])
+
+    try:
+        await measure("inline", sign_inline(jobs), len(jobs))
+        await measure("pool", sign_pooled(jobs, signer), len(jobs))
+    finally:
+        await signer.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
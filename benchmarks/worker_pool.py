@@ -0,0 +1,62 @@
+"""Memory and throughput of one task per wallet vs the streaming worker pool
+
+Run from the repository root:
+    python -m benchmarks.worker_pool --wallets 10000 100000 --workers 20
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from utils.processing.worker_pool import WorkerPool
+
+
+def iter_wallets(count: int):
+    for i in range(count):
+        yield i + 1, f"{i + 1:064x}", f"0x{i + 1:040x}"
+
+
+async def fake_bridge(job: tuple[int, str, str], semaphore: asyncio.Semaphore) -> None:
+    async with semaphore:
+        await asyncio.sleep(0.001)
+
+
+async def run_tasks(count: int, workers: int) -> None:
+    semaphore = asyncio.Semaphore(workers)
+    tasks = [asyncio.create_task(fake_bridge(job, semaphore)) for job in iter_wallets(count)]
+    await asyncio.gather(*tasks)
+
+
+async def run_pool(count: int, workers: int) -> None:
+    semaphore = asyncio.Semaphore(workers)
+    pool = WorkerPool(workers=workers, queue_size=workers * 5)
+    await pool.run(iter_wallets(count), lambda job: fake_bridge(job, semaphore))
+
+
+def measure(name: str, runner, count: int, workers: int) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    asyncio.run(runner(count, workers))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<16} | wallets: {count:>7} | peak memory: {peak / 1024 / 1024:8.2f} MiB "
+        f"| elapsed: {elapsed:7.2f}s | throughput: {count / elapsed:9.0f} wallets/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wallets", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--workers", type=int, default=20)
+    args = parser.parse_args()
+
+    for count in args.wallets:
+        measure("task per wallet", run_tasks, count, args.workers)
+        measure("worker pool", run_pool, count, args.workers)
+
+
+if __name__ == "__main__":
+    main()
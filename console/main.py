@@ -23,10 +23,14 @@ sys.path.append(os.path.realpath("."))
 class Console:
     MODULES = (
         "🔑 Launch sender",
+        "🔁 Resume sender",
+        "📦 Import wallets.txt into key store",
         "❌ Exit",
     )
     MODULES_DATA = {
         "🔑 Launch sender": "launch_sender",
+        "🔁 Resume sender": "resume_sender",
+        "📦 Import wallets.txt into key store": "import_key_store",
         "❌ Exit": "exit",
     }
 
@@ -1,80 +1,486 @@
 import asyncio
 import random
 
+from typing import Awaitable, Sequence
+
+from eth_account import Account
+from hexbytes import HexBytes
 from loguru import logger
-from loader import config, semaphore, proxy_manager, file_operations
+from loader import (
+    config,
+    address_cache,
+    concurrency_limiter,
+    proxy_manager,
+    file_operations,
+    web3_services,
+    rpc_session_pool,
+    rpc_cache,
+    quote_router,
+    gaszip_health,
+    http_clients,
+    rate_limiter,
+    block_watcher,
+    bridge_pipeline,
+    run_journal,
+)
 from core.web3.modules.sender import SenderModule
+from core.web3.multicall import BalanceScanner
+from core.web3.preflight import PreflightScanner, WalletSnapshot
+from utils.base.key_store import KeyStore
+from utils.base.run_journal import RunJournal
+from utils.processing.delay_scheduler import DelayScheduler
+from utils.processing.worker_pool import WorkerPool
 
 
 
 class Bot:
 
+    def __init__(self):
+        # Wallets that left their worker after broadcasting and are still waiting for receipts
+        self.confirming: set[asyncio.Task] = set()
+        self.wallet_stats = {"completed": 0, "unfunded": 0}
+
+    @staticmethod
+    async def bridge_once(
+            sender: SenderModule,
+            amount: float,
+            wallet_index: int,
+            label: str,
+            bridge: int = 0,
+            dispatched: asyncio.Event = None,
+    ) -> bool:
+        chains = ", ".join(destination.label for destination in config.web3_settings.destinations)
+        logger.info(f"Wallet {wallet_index}{label} | Bridging {amount:.8f} BNB to {chains}..")
+        broadcast = []
+
+        def on_broadcast(tx_hash: HexBytes, nonce: int) -> None:
+            # Written before the receipt wait, so a restart re-tracks the transaction instead of sending it again
+            broadcast.append(tx_hash)
+            if dispatched:
+                dispatched.set()
+            if run_journal:
+                run_journal.record(sender.wallet_address, bridge, RunJournal.BROADCAST, tx_hash=tx_hash.to_0x_hex(), nonce=nonce)
+
+        if run_journal:
+            run_journal.record(sender.wallet_address, bridge, RunJournal.STARTED, wallet_index=wallet_index, amount=amount)
+
+        if bridge_pipeline and bridge_pipeline.running:
+            status, result = await bridge_pipeline.bridge(sender, amount, on_broadcast)
+        else:
+            status, result = await sender.process_bridge(amount, on_broadcast)
+
+        # The tx hash comes back only with a receipt, a failed bridge that returns it was mined and reverted
+        reverted = not status and bool(broadcast) and result == broadcast[0].hex()
+        if status:
+            tx = f"https://bscscan.com/tx/0x{result}" if not result.startswith("0x") else f"https://bscscan.com/tx/{result}"
+            logger.success(f"Wallet {wallet_index}{label} | Successfully bridged {amount:.8f} BNB to {chains} | TX: {tx}")
+        elif reverted:
+            result = "Transaction reverted"
+            logger.error(f"Wallet {wallet_index}{label} | Failed to bridge {amount:.8f} BNB to {chains} | Error: {result} | TX: https://bscscan.com/tx/{broadcast[0].to_0x_hex()}")
+        else:
+            logger.error(f"Wallet {wallet_index}{label} | Failed to bridge {amount:.8f} BNB to {chains} | Error: {result}")
+
+        if run_journal:
+            # A broadcast transaction without a receipt stays pending until a resumed run checks it
+            stage = RunJournal.CONFIRMED if status else RunJournal.BROADCAST if broadcast and not reverted else RunJournal.FAILED
+            run_journal.record(sender.wallet_address, bridge, stage, error=None if status else result)
+
+        await file_operations.export_result(f"Wallet_{wallet_index}", status, "sender")
+        return status
+
+    @staticmethod
+    async def retrack(sender: SenderModule, entry, wallet_index: int, label: str) -> bool:
+        tx_hash = entry["tx_hash"]
+        logger.info(f"Wallet {wallet_index}{label} | Re-tracking transaction {tx_hash} broadcast in a previous run..")
+
+        try:
+            receipt = await sender.wait_for_receipt(HexBytes(tx_hash))
+        except Exception as e:
+            try:
+                dropped = await sender.transaction_dropped(HexBytes(tx_hash), entry["nonce"])
+            except Exception:
+                dropped = False
+
+            if not dropped:
+                logger.warning(f"Wallet {wallet_index}{label} | Transaction {tx_hash} is still not confirmed, it is kept for the next resume | Error: {e}")
+                return False
+
+            # The nonce was taken by another transaction (e.g. a nonce gap fill), so the bridge never happened
+            error = "Transaction was dropped or replaced"
+            run_journal.record(sender.wallet_address, entry["bridge"], RunJournal.FAILED, error=error)
+            logger.error(f"Wallet {wallet_index}{label} | {error}, it is sent again on the next resume | TX: {tx_hash}")
+            await file_operations.export_result(f"Wallet_{wallet_index}", False, "sender")
+            return False
+
+        status = receipt["status"] == 1
+        run_journal.record(sender.wallet_address, entry["bridge"], RunJournal.CONFIRMED if status else RunJournal.FAILED)
+        if status:
+            logger.success(f"Wallet {wallet_index}{label} | Bridge from the previous run is confirmed | TX: https://bscscan.com/tx/{tx_hash}")
+        else:
+            logger.error(f"Wallet {wallet_index}{label} | Bridge from the previous run reverted | TX: https://bscscan.com/tx/{tx_hash}")
+
+        await file_operations.export_result(f"Wallet_{wallet_index}", status, "sender")
+        return status
+
     @staticmethod
+    async def fail_bridges(address: str, amounts: list[float], wallet_index: int, error: str) -> None:
+        logger.error(f"Wallet {wallet_index} | Failed before bridging | Error: {error}")
+        for n, amount in enumerate(amounts):
+            entry = run_journal.get(address, n) if run_journal else None
+            # Bridges that are confirmed or still pending from a previous run keep their state
+            if entry and entry["stage"] in (RunJournal.CONFIRMED, RunJournal.BROADCAST):
+                continue
+
+            if run_journal:
+                run_journal.record(address, n, RunJournal.FAILED, wallet_index=wallet_index, amount=amount, error=error)
+            await file_operations.export_result(f"Wallet_{wallet_index}", False, "sender")
+
     async def safe_bridge(
-            delay: int,
+            self,
             private_key: str,
             rpc_url: str,
             target_address: str,
-            amount: float,
+            amounts: list[float],
             proxy: str,
-            wallet_index: int = None
-    ):
-        sender = None
-
-        async with semaphore:
+            wallet_index: int = None,
+            snapshot: WalletSnapshot = None,
+            address: str = None
+    ) -> asyncio.Task | None:
+        """Returns the task still confirming the wallet's bridges when it left its worker early"""
+        # Checked local calldata does not need the API, an outage does not hold the bridge back
+        encoder_ready = web3_services.deposit_encoder and web3_services.deposit_encoder.ready
+        if gaszip_health and gaszip_health.running and not encoder_ready:
             try:
-                if delay > 0:
-                    logger.info(f"Wallet {wallet_index} | Waiting for {delay} seconds before starting..")
-                    await asyncio.sleep(delay)
-
-                logger.info(f"Wallet {wallet_index} | Bridging {amount:.8f} BNB to opBNB..")
-                sender = SenderModule(
-                    private_key=private_key,
-                    target_address="",  # Not used for bridging
-                    rpc_url=rpc_url,
-                    proxy=proxy
-                )
-                status, result = await sender.process_bridge(amount)
+                await gaszip_health.wait_until_healthy()
+            except Exception as e:
+                await self.fail_bridges(address, amounts, wallet_index, str(e))
+                return
+
+        async with concurrency_limiter:
+            sender = SenderModule(
+                private_key=private_key,
+                target_address="",  # Not used for bridging
+                rpc_url=rpc_url,
+                proxy=proxy,
+                services=web3_services,
+                snapshot=snapshot,
+                address=address,
+                destination_chain_ids=[destination.chain_id for destination in config.web3_settings.destinations]
+            )
+
+            bridges = []
+            dispatched = []
+            for n, amount in enumerate(amounts):
+                label = f" | Bridge {n + 1}/{len(amounts)}" if len(amounts) > 1 else ""
+                entry = run_journal.get(sender.wallet_address, n) if run_journal else None
 
-                if status:
-                    tx = f"https://bscscan.com/tx/0x{result}" if not result.startswith("0x") else f"https://bscscan.com/tx/{result}"
-                    logger.success(f"Wallet {wallet_index} | Successfully bridged {amount:.8f} BNB to opBNB | TX: {tx}")
+                if entry and entry["stage"] == RunJournal.CONFIRMED:
+                    continue
+                if entry and entry["stage"] == RunJournal.BROADCAST and entry["tx_hash"]:
+                    bridges.append(self.retrack(sender, entry, wallet_index, label))
                 else:
-                    logger.error(f"Wallet {wallet_index} | Failed to bridge {amount:.8f} BNB to opBNB | Error: {result}")
+                    event = asyncio.Event()
+                    bridge = asyncio.create_task(self.bridge_once(sender, amount, wallet_index, label, n, event))
+                    # A bridge that failed before broadcasting does not hold its wallet back either
+                    bridge.add_done_callback(lambda _, event=event: event.set())
+                    dispatched.append(event)
+                    bridges.append(bridge)
 
-                await file_operations.export_result(f"Wallet_{wallet_index}", status, "sender")
+            # Nonces are handed out locally, so all bridges of a wallet are in flight at once
+            finish = asyncio.create_task(self.finish_wallet(sender, bridges))
+            if not (bridge_pipeline and bridge_pipeline.running):
+                await finish
+                return None
 
-            finally:
-                if sender:
-                    await sender.cleanup()
+            # The pipeline stages bound the work in flight, so the wallet gives back its limiter slot
+            # and worker once its bridges are broadcast and the confirm stage finishes them
+            broadcast = asyncio.ensure_future(asyncio.gather(*(event.wait() for event in dispatched)))
+            await asyncio.wait([finish, broadcast], return_when=asyncio.FIRST_COMPLETED)
+            broadcast.cancel()
+            return None if finish.done() else finish
 
+    @staticmethod
+    async def finish_wallet(sender: SenderModule, bridges: list[Awaitable[bool]]) -> None:
+        try:
+            await asyncio.gather(*bridges)
+            await sender.settle_nonces()
+        finally:
+            await sender.cleanup()
 
-    async def process_bridges(self):
-        tasks = []
+    @staticmethod
+    async def resolve_addresses() -> Sequence[str]:
+        private_keys = config.wallet_private_keys
+        if isinstance(private_keys, KeyStore):
+            # Derived when the key store was imported
+            return config.wallet_addresses
 
-        logger.info(f"Preparing BNB bridge tasks for {len(config.wallet_private_keys)} wallets")
-        
-        for i, private_key in enumerate(config.wallet_private_keys):
-            amount_to_bridge = round(random.uniform(config.web3_settings.amount_to_bridge.min, config.web3_settings.amount_to_bridge.max), 8)
-            proxy = await proxy_manager.get_proxy()
-            delay = random.randint(
-                config.attempts_and_delay_settings.delay_before_start.min,
-                config.attempts_and_delay_settings.delay_before_start.max
-            ) if config.attempts_and_delay_settings.delay_before_start.max > 0 else 0
-
-            tasks.append(
-                asyncio.create_task(
-                    self.safe_bridge(
-                        delay=delay,
-                        private_key=private_key,
-                        rpc_url=config.web3_settings.bsc_rpc_url,
-                        target_address="",  # Not used for bridging
-                        amount=amount_to_bridge,
-                        proxy=proxy.as_url,
-                        wallet_index=i + 1
-                    )
+        addresses = list(config.wallet_addresses) or [None] * len(private_keys)
+        missing = [i for i, address in enumerate(addresses) if address is None]
+
+        if missing:
+            missing_keys = [private_keys[i] for i in missing]
+            if web3_services.signer and web3_services.signer.running:
+                derived = await web3_services.signer.derive_addresses(missing_keys)
+            else:
+                derived = [Account.from_key(private_key).address for private_key in missing_keys]
+
+            for i, address in zip(missing, derived):
+                addresses[i] = address
+            logger.info(f"Derived {len(missing)} wallet addresses, {len(private_keys) - len(missing)} loaded from the address cache")
+
+        config.wallet_addresses = addresses
+        address_cache.update(private_keys, addresses)
+        address_cache.save()
+        return addresses
+
+    @staticmethod
+    def create_balance_scanner() -> BalanceScanner | None:
+        settings = config.web3_settings.balance_scan
+        if not settings.enabled:
+            return None
+
+        return BalanceScanner(
+            rpc_url=config.web3_settings.bsc_rpc_url,
+            proxy=config.proxies[0] if config.proxies else None,
+            services=web3_services,
+            batch_size=settings.batch_size,
+        )
+
+    @staticmethod
+    async def run_balance_scan(scanner: BalanceScanner | None, addresses: Sequence[str]) -> set[str] | None:
+        if not scanner or not addresses:
+            return None
+
+        try:
+            gas_price = await scanner.gas_price()
+            balances = await scanner.scan(addresses)
+        except Exception as e:
+            logger.warning(f"Balance scan failed, {len(addresses)} wallets will be processed without it | Error: {e}")
+            return None
+
+        bridges = config.web3_settings.bridges_per_wallet
+        reserve = config.web3_settings.balance_scan.gas_limit_reserve
+        required = (int(scanner.web3.to_wei(config.web3_settings.max_deposit, "ether")) + gas_price * reserve) * bridges
+        # Addresses whose balance could not be read are kept and checked later by the sender
+        return {address for address in addresses if balances.get(address, required) >= required}
+
+    @staticmethod
+    def create_preflight_scanner() -> PreflightScanner | None:
+        settings = config.web3_settings.preflight
+        if not settings.enabled:
+            return None
+
+        return PreflightScanner(
+            rpc_url=config.web3_settings.bsc_rpc_url,
+            proxy=config.proxies[0] if config.proxies else None,
+            services=web3_services,
+            batch_size=settings.batch_size,
+            max_age=settings.max_age,
+        )
+
+    @staticmethod
+    async def start_services():
+        await file_operations.start_writer()
+        if gaszip_health:
+            await gaszip_health.start()
+        if web3_services.gas_oracle:
+            await web3_services.gas_oracle.update()
+        if web3_services.receipt_tracker or web3_services.gas_oracle:
+            await block_watcher.start()
+        if bridge_pipeline:
+            await bridge_pipeline.start()
+        if web3_services.signer:
+            await web3_services.signer.start()
+
+    @staticmethod
+    async def stop_services():
+        await file_operations.stop_writer()
+        if gaszip_health:
+            await gaszip_health.stop()
+        await block_watcher.stop()
+        if bridge_pipeline:
+            logger.info(f"Pipeline stages | {bridge_pipeline.describe()}")
+            await bridge_pipeline.stop()
+        if web3_services.signer:
+            logger.info(f"Signer service stats: {web3_services.signer.stats()}")
+            await web3_services.signer.stop()
+
+        quote_router.save()
+        if rpc_cache:
+            logger.info(f"RPC cache stats: {rpc_cache.stats()}")
+        if web3_services.deposit_encoder:
+            logger.info(f"Deposit encoder stats: {web3_services.deposit_encoder.stats()}")
+        if web3_services.quote_cache:
+            logger.info(f"Quote cache stats: {web3_services.quote_cache.stats()}")
+        if web3_services.gas_limits:
+            logger.info(f"Gas limit cache stats: {web3_services.gas_limits.stats()}")
+        if web3_services.gas_oracle:
+            logger.info(f"Gas oracle stats: {web3_services.gas_oracle.stats()}")
+        if web3_services.receipt_tracker:
+            logger.info(f"Receipt tracker stats: {web3_services.receipt_tracker.stats()}")
+        logger.info(f"Concurrency limiter state: {concurrency_limiter.stats()}")
+        logger.info(f"Rate limiter wait time per host (s): {rate_limiter.stats()}")
+        if web3_services.rpc_router and len(web3_services.rpc_router.endpoints) > 1:
+            logger.info(f"RPC endpoints: {web3_services.rpc_router.stats()}")
+        if run_journal:
+            logger.info(f"Run journal stages: {run_journal.stats()}")
+        await http_clients.close()
+        await rpc_session_pool.close()
+
+    async def process_bridges(self, resume: bool = False):
+        if run_journal and not resume:
+            stages = run_journal.stats()
+            broadcast, confirmed = stages.get(RunJournal.BROADCAST, 0), stages.get(RunJournal.CONFIRMED, 0)
+            if broadcast or confirmed:
+                # A fresh run would send every wallet again, including the ones already bridged
+                logger.error(
+                    f"Run journal holds {broadcast} pending and {confirmed} confirmed bridges from a previous run | "
+                    f"Use \"Resume sender\" to continue it, or delete {run_journal.path} to start a new run"
                 )
+                return
+            run_journal.reset()
+
+        await self.start_services()
+        try:
+            await self.run_bridges(resume)
+        finally:
+            await self.stop_services()
+
+    async def iter_wallets(self, addresses: Sequence[str], resume: bool = False):
+        """Yields wallet jobs chunk by chunk, the next chunk is scanned while the current one is queued
+
+        Balances and pre-flight snapshots are only held for the wallets about to start, so memory
+        stays flat with the wallet count and snapshots are fresh when their wallet is bridged.
+        """
+        size = config.web3_settings.balance_scan.batch_size
+        scanners = self.create_balance_scanner(), self.create_preflight_scanner()
+        prepared = None
+        try:
+            for start in range(0, len(addresses), size):
+                prepared = prepared or asyncio.ensure_future(self.prepare_chunk(scanners, addresses, start, size, resume))
+                jobs = await prepared
+                prepared = asyncio.ensure_future(
+                    self.prepare_chunk(scanners, addresses, start + size, size, resume)
+                ) if start + size < len(addresses) else None
+
+                for job in jobs:
+                    yield job
+        finally:
+            if prepared:
+                prepared.cancel()
+
+    async def prepare_chunk(
+            self,
+            scanners: tuple[BalanceScanner | None, PreflightScanner | None],
+            addresses: Sequence[str],
+            start: int,
+            size: int,
+            resume: bool,
+    ) -> list[tuple[int, str, str, WalletSnapshot | None]]:
+        balance_scanner, preflight_scanner = scanners
+        indexes = range(start, min(start + size, len(addresses)))
+        pending = [i for i in indexes if not self.is_completed(addresses[i], resume)]
+        self.wallet_stats["completed"] += len(indexes) - len(pending)
+
+        # A deposit from the previous run may have spent the balance already, those wallets are re-tracked instead
+        tracked = {addresses[i] for i in pending if run_journal.broadcast(addresses[i])} if resume and run_journal else set()
+        funded = await self.run_balance_scan(balance_scanner, [addresses[i] for i in pending if addresses[i] not in tracked])
+        if funded is not None:
+            funded |= tracked
+
+        jobs = []
+        for i in pending:
+            if funded is not None and addresses[i] not in funded:
+                self.wallet_stats["unfunded"] += 1
+                await file_operations.export_result(f"Wallet_{i + 1}", False, "sender")
+                continue
+            jobs.append(i)
+
+        snapshots = await preflight_scanner.fetch([addresses[i] for i in jobs]) if preflight_scanner else {}
+        return [(i + 1, config.wallet_private_keys[i], addresses[i], snapshots.get(addresses[i])) for i in jobs]
+
+    @staticmethod
+    def is_completed(address: str, resume: bool) -> bool:
+        return resume and run_journal is not None and run_journal.completed(address, config.web3_settings.bridges_per_wallet)
+
+    @staticmethod
+    def start_delay(job: tuple[int, str, str, WalletSnapshot | None]) -> int:
+        delay = random.randint(
+            config.attempts_and_delay_settings.delay_before_start.min,
+            config.attempts_and_delay_settings.delay_before_start.max
+        ) if config.attempts_and_delay_settings.delay_before_start.max > 0 else 0
+
+        if delay > 0:
+            logger.info(f"Wallet {job[0]} | Scheduled to start in {delay} seconds..")
+        return delay
+
+    async def process_wallet(self, job: tuple[int, str, str, WalletSnapshot | None]):
+        wallet_index, private_key, address, snapshot = job
+        # Each deposit covers every destination chain with the same share drawn from their common range
+        share_range, chains = config.web3_settings.share_range, len(config.web3_settings.destinations)
+        amounts_to_bridge = [
+            round(round(random.uniform(share_range.min, share_range.max), 8) * chains, 8)
+            for _ in range(config.web3_settings.bridges_per_wallet)
+        ]
+        # Proxies are taken when the wallet starts and handed back when it is done
+        proxy = await proxy_manager.get_proxy() if config.proxies else None
+        confirming = None
+        try:
+            confirming = await self.safe_bridge(
+                private_key=private_key,
+                rpc_url=config.web3_settings.bsc_rpc_url,
+                target_address="",  # Not used for bridging
+                amounts=amounts_to_bridge,
+                proxy=proxy.as_url if proxy else None,
+                wallet_index=wallet_index,
+                snapshot=snapshot,
+                address=address
             )
+        finally:
+            if confirming:
+                self.track_confirming(confirming, proxy)
+            elif proxy:
+                await proxy_manager.release_proxy(proxy)
+
+    def track_confirming(self, confirming: asyncio.Task, proxy) -> None:
+        async def settle():
+            try:
+                await confirming
+            finally:
+                # The wallet still talks to the RPC through its proxy until its receipts are in
+                if proxy:
+                    await proxy_manager.release_proxy(proxy)
+
+        task = asyncio.create_task(settle())
+        self.confirming.add(task)
+        task.add_done_callback(self.confirming.discard)
+
+    async def run_bridges(self, resume: bool = False):
+        logger.info(f"Preparing BNB bridge tasks for {len(config.wallet_private_keys)} wallets")
+
+        addresses = await self.resolve_addresses()
+        if resume and run_journal:
+            logger.info("Resuming previous run, wallets that are already bridged will be skipped")
 
-        logger.success(f"Prepared {len(tasks)} BNB bridge tasks for {len(config.wallet_private_keys)} wallets. Starting execution..")
-        await asyncio.gather(*tasks)
+        pool = WorkerPool(
+            workers=config.concurrency_settings.max,
+            queue_size=config.concurrency_settings.queue_size,
+        )
+        logger.success(f"Starting {pool.workers} workers for {len(config.wallet_private_keys)} wallets..")
+        # Start delays are waited out in the scheduler, workers only get wallets that are due
+        scheduler = DelayScheduler(
+            delay=self.start_delay,
+            capacity=config.attempts_and_delay_settings.schedule_capacity,
+        )
+        await pool.run(
+            scheduler.schedule(self.iter_wallets(addresses, resume)),
+            self.process_wallet
+        )
+        logger.info(f"Worker pool finished | Stats: {pool.stats()} | Scheduler: {scheduler.stats()}")
+        if self.wallet_stats["completed"]:
+            logger.info(f"Skipped {self.wallet_stats['completed']} wallets that were already bridged")
+        if self.wallet_stats["unfunded"]:
+            logger.warning(f"Skipped {self.wallet_stats['unfunded']} wallets that cannot cover the bridge amount plus gas")
+        if self.confirming:
+            logger.info(f"Waiting for {len(self.confirming)} wallets to confirm their bridges..")
+            await asyncio.gather(*self.confirming, return_exceptions=True)
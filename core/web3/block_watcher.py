@@ -0,0 +1,61 @@
+import asyncio
+
+from typing import Awaitable, Callable
+
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.eth import AsyncEth
+
+from core.web3.services import Web3Services
+
+
+class BlockWatcher:
+    """Polls the latest block number once per interval and notifies subscribers about new heads"""
+
+    def __init__(self, rpc_url: str, proxy: str = None, services: Web3Services = None, poll_interval: float = 1):
+        services = services or Web3Services()
+        self.web3 = AsyncWeb3(provider=services.create_provider(rpc_url, proxy), modules={"eth": (AsyncEth,)})
+        self.poll_interval = poll_interval
+        self.subscribers: list[Callable[[int], Awaitable[None]]] = []
+        self.latest_block: int | None = None
+        self.task: asyncio.Task | None = None
+
+    def subscribe(self, callback: Callable[[int], Awaitable[None]]) -> None:
+        self.subscribers.append(callback)
+
+    async def _notify(self, block_number: int) -> None:
+        results = await asyncio.gather(*(callback(block_number) for callback in self.subscribers), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Block {block_number} subscriber failed: {result}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                block_number = await self.web3.eth.block_number
+                if self.latest_block is None or block_number > self.latest_block:
+                    self.latest_block = block_number
+                    await self._notify(block_number)
+            except Exception as e:
+                logger.warning(f"Cannot fetch latest block number: {e}")
+
+            await asyncio.sleep(self.poll_interval)
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None
+
+    async def start(self) -> None:
+        if not self.task:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.task:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
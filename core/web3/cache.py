@@ -0,0 +1,210 @@
+import asyncio
+import random
+import time
+
+from typing import Any, Awaitable, Callable, Hashable
+
+from hexbytes import HexBytes
+from loguru import logger
+from web3 import AsyncWeb3
+
+
+class AsyncTTLCache:
+    """Async value cache with optional expiry where concurrent misses share one in-flight fetch"""
+
+    def __init__(self, ttl: float | None = None):
+        self.ttl = ttl
+        self.values: dict[Hashable, tuple[Any, float]] = {}
+        self.in_flight: dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def _get_valid(self, key: Hashable) -> tuple[bool, Any]:
+        if key not in self.values:
+            return False, None
+
+        value, stored_at = self.values[key]
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self.values[key]
+            return False, None
+
+        return True, value
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        found, value = self._get_valid(key)
+        if found:
+            self.hits += 1
+            return value
+
+        if key in self.in_flight:
+            self.shared += 1
+            return await asyncio.shield(self.in_flight[key])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+
+        try:
+            value = await fetch()
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark the exception as retrieved when nobody else was waiting for it
+            future.exception()
+            raise
+        else:
+            self.values[key] = (value, time.monotonic())
+            future.set_result(value)
+            return value
+        finally:
+            self.in_flight.pop(key, None)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.values[key] = (value, time.monotonic())
+
+    def invalidate(self, key: Hashable) -> None:
+        self.values.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "shared": self.shared}
+
+
+class RpcCache:
+    """Caches chain-constant and slowly changing RPC values per endpoint"""
+
+    def __init__(self, gas_price_ttl: float = 3):
+        self.chain_ids = AsyncTTLCache(ttl=None)
+        self.gas_prices = AsyncTTLCache(ttl=gas_price_ttl)
+
+    @staticmethod
+    def _endpoint(web3: AsyncWeb3) -> str:
+        return str(getattr(web3.provider, "endpoint_uri", ""))
+
+    async def chain_id(self, web3: AsyncWeb3) -> int:
+        return await self.chain_ids.get_or_fetch(self._endpoint(web3), lambda: web3.eth.chain_id)
+
+    async def gas_price(self, web3: AsyncWeb3) -> int:
+        return await self.gas_prices.get_or_fetch(self._endpoint(web3), lambda: web3.eth.gas_price)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {"chain_id": self.chain_ids.stats(), "gas_price": self.gas_prices.stats()}
+
+
+class GasLimitCache:
+    """Gas estimates keyed by (target, selector, calldata length, value bucket)
+
+    The raw estimate is cached and returned with ``safety_margin`` applied. A ``sample_rate``
+    share of hits is estimated live anyway, so the cache follows changes of the contract.
+    """
+
+    def __init__(self, safety_margin: float = 1.2, sample_rate: float = 0.05, ttl: float | None = 600):
+        self.safety_margin = safety_margin
+        self.sample_rate = sample_rate
+        self.estimates = AsyncTTLCache(ttl=ttl)
+        self.sampled = 0
+        self.out_of_gas = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def key(transaction: dict) -> tuple:
+        data = HexBytes(transaction.get("data") or b"")
+        value = int(transaction.get("value", 0))
+        # Values are bucketed by power of two, deposits of similar size cost the same gas
+        return str(transaction.get("to", "")).lower(), data[:4].hex(), len(data), value.bit_length()
+
+    async def gas_limit(self, transaction: dict, estimate: Callable[[], Awaitable[int]]) -> int:
+        key = self.key(transaction)
+        if random.random() < self.sample_rate:
+            self.sampled += 1
+            self.estimates.invalidate(key)
+
+        leader = False
+
+        async def fetch() -> int:
+            nonlocal leader
+            leader = True
+            return await estimate()
+
+        try:
+            raw = await self.estimates.get_or_fetch(key, fetch)
+        except Exception:
+            if leader:
+                raise
+            # Estimate errors depend on the wallet (e.g. insufficient funds), waiters estimate for themselves
+            self.fallbacks += 1
+            raw = await estimate()
+        return int(raw * self.safety_margin)
+
+    def report_receipt(self, transaction: dict, receipt: Any) -> None:
+        """Drops the cached estimate when a transaction reverted after using all of its gas"""
+        if receipt["status"] == 1 or receipt["gasUsed"] < int(transaction.get("gas", 0)):
+            return
+
+        self.out_of_gas += 1
+        self.estimates.invalidate(self.key(transaction))
+
+    def stats(self) -> dict[str, int]:
+        return {**self.estimates.stats(), "sampled": self.sampled, "out_of_gas": self.out_of_gas, "fallbacks": self.fallbacks}
+
+
+class QuoteCache:
+    """GasZip deposit calldata keyed by (destination chain, recipient mode), shared by all wallets
+
+    A self-bridge deposit does not encode the amount, so one quote serves every wallet until
+    ``ttl`` expires. A ``verify_rate`` share of requests fetches a fresh quote anyway and replaces
+    the cached calldata when GasZip started returning something different.
+    """
+
+    def __init__(self, ttl: float | None = 300, verify_rate: float = 0.05):
+        self.verify_rate = verify_rate
+        self.quotes = AsyncTTLCache(ttl=ttl)
+        self.last_seen: dict[Hashable, str] = {}
+        self.verified = 0
+        self.changed = 0
+        self.invalidated = 0
+
+    @staticmethod
+    def validate(call_data: Any) -> str:
+        if not isinstance(call_data, str):
+            raise Exception(f"GasZip calldata is not a string: {call_data!r}")
+
+        try:
+            data = HexBytes(call_data)
+        except ValueError:
+            raise Exception(f"GasZip calldata is not hex: {call_data[:50]}")
+        if not data:
+            raise Exception("GasZip calldata is empty")
+
+        return "0x" + data.hex().removeprefix("0x")
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[str]]) -> str:
+        call_data = self.validate(await fetch())
+        previous = self.last_seen.get(key)
+        if previous is not None and previous != call_data:
+            self.changed += 1
+            logger.warning(f"GasZip calldata for {key} changed: {previous[:50]} -> {call_data[:50]}")
+
+        self.last_seen[key] = call_data
+        return call_data
+
+    async def call_data(self, key: Hashable, fetch: Callable[[], Awaitable[str]]) -> str:
+        if random.random() < self.verify_rate:
+            self.verified += 1
+            call_data = await self._fetch(key, fetch)
+            self.quotes.set(key, call_data)
+            return call_data
+
+        return await self.quotes.get_or_fetch(key, lambda: self._fetch(key, fetch))
+
+    def invalidate(self, key: Hashable) -> None:
+        if key in self.quotes.values:
+            self.invalidated += 1
+        self.quotes.invalidate(key)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **self.quotes.stats(),
+            "verified": self.verified,
+            "changed": self.changed,
+            "invalidated": self.invalidated,
+        }
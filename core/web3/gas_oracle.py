@@ -0,0 +1,98 @@
+import time
+
+from statistics import median
+
+from loguru import logger
+
+from core.web3.block_watcher import BlockWatcher
+
+
+class GasOracle:
+    """Recommended gas price refreshed from ``eth_feeHistory`` on every new block
+
+    The price is the next base fee plus the median over recent non-empty blocks of the
+    ``percentile`` priority fee. When recent blocks are fuller than ``congestion_ratio`` the
+    ``burst_percentile`` is used instead, so transactions sent during a burst do not get stuck.
+    """
+
+    def __init__(
+            self,
+            block_watcher: BlockWatcher,
+            block_count: int = 20,
+            percentile: float = 50,
+            burst_percentile: float = 90,
+            congestion_ratio: float = 0.9,
+            min_gas_price: int = 0,
+            max_gas_price: int = None,
+            max_age: float = 30,
+    ):
+        self.block_watcher = block_watcher
+        self.block_count = block_count
+        self.percentile = percentile
+        self.burst_percentile = burst_percentile
+        self.congestion_ratio = congestion_ratio
+        self.min_gas_price = min_gas_price
+        self.max_gas_price = max_gas_price
+        self.max_age = max_age
+
+        self.gas_price: int | None = None
+        self.congested = False
+        self.updated_at = 0.0
+        self.updates = 0
+        self.block_watcher.subscribe(self.on_block)
+
+    @property
+    def running(self) -> bool:
+        return self.block_watcher.running
+
+    @property
+    def recommended(self) -> int | None:
+        # A stale value means the watcher stopped getting blocks, callers fall back to eth_gasPrice
+        if self.gas_price is None or time.monotonic() - self.updated_at > self.max_age:
+            return None
+        return self.gas_price
+
+    def _clamp(self, gas_price: int) -> int:
+        gas_price = max(gas_price, self.min_gas_price)
+        if self.max_gas_price:
+            gas_price = min(gas_price, self.max_gas_price)
+        return gas_price
+
+    async def _compute(self) -> int:
+        web3 = self.block_watcher.web3
+        history = await web3.eth.fee_history(self.block_count, "latest", [self.percentile, self.burst_percentile])
+
+        ratios = history["gasUsedRatio"]
+        recent = ratios[-3:]
+        self.congested = bool(recent) and sum(recent) / len(recent) >= self.congestion_ratio
+        column = 1 if self.congested else 0
+
+        # Empty blocks report a zero reward and would drag the median down
+        rewards = [reward[column] for reward, ratio in zip(history.get("reward", []), ratios) if ratio > 0]
+        if not rewards:
+            return await web3.eth.gas_price
+
+        return history["baseFeePerGas"][-1] + int(median(rewards))
+
+    async def update(self) -> None:
+        try:
+            gas_price = self._clamp(await self._compute())
+        except Exception as e:
+            logger.warning(f"Gas oracle update failed, keeping the last price | Error: {e}")
+            return
+
+        if self.gas_price != gas_price:
+            logger.debug(f"Gas oracle price: {gas_price / 10 ** 9:.3f} gwei | Congested: {self.congested}")
+        self.gas_price = gas_price
+        self.updated_at = time.monotonic()
+        self.updates += 1
+
+    async def on_block(self, block_number: int) -> None:
+        await self.update()
+
+    def stats(self) -> dict:
+        return {
+            "gas_price_gwei": round(self.gas_price / 10 ** 9, 3) if self.gas_price is not None else None,
+            "congested": self.congested,
+            "updates": self.updates,
+        }
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from eth_account.datastructures import SignedTransaction
+from hexbytes import HexBytes
+from web3.types import TxParams
+
+from core.web3.modules.sender import SenderModule
+from utils.processing.pipeline import Pipeline, Stage
+
+
+@dataclass
+class BridgeJob:
+    sender: SenderModule
+    amount: float
+    call_data: str | None = None
+    transaction: TxParams | None = None
+    signed: SignedTransaction | None = None
+    tx_hash: HexBytes | None = None
+    status: bool = False
+    on_broadcast: Callable[[HexBytes, int], None] | None = None
+
+
+class BridgePipeline(Pipeline):
+    """quote -> build -> sign -> broadcast -> confirm, quotes for upcoming bridges are fetched while others confirm"""
+
+    def __init__(
+            self,
+            quote_workers: int = 10,
+            build_workers: int = 10,
+            sign_workers: int = 4,
+            broadcast_workers: int = 10,
+            confirm_workers: int = 200,
+            queue_size: int = 100,
+            report_interval: float = 30,
+    ):
+        super().__init__(
+            [
+                Stage("quote", self.quote, quote_workers, queue_size),
+                Stage("build", self.build, build_workers, queue_size),
+                Stage("sign", self.sign, sign_workers, queue_size),
+                Stage("broadcast", self.broadcast, broadcast_workers, queue_size),
+                Stage("confirm", self.confirm, confirm_workers, queue_size),
+            ],
+            report_interval=report_interval,
+        )
+
+    @staticmethod
+    async def quote(job: BridgeJob) -> BridgeJob:
+        await job.sender.ensure_gaszip_available()
+        job.call_data = await job.sender.create_quote(int(job.sender.to_wei(job.amount, "ether")))
+        return job
+
+    @staticmethod
+    async def build(job: BridgeJob) -> BridgeJob:
+        job.transaction = await job.sender.prepare_transaction(job.amount, job.call_data)
+        return job
+
+    @staticmethod
+    async def sign(job: BridgeJob) -> BridgeJob:
+        job.signed = await job.sender.sign(job.transaction)
+        return job
+
+    @staticmethod
+    async def broadcast(job: BridgeJob) -> BridgeJob:
+        job.tx_hash = await job.sender.send_signed_transaction(job.transaction, job.signed)
+        if job.on_broadcast:
+            job.on_broadcast(job.tx_hash, job.transaction["nonce"])
+        return job
+
+    @staticmethod
+    async def confirm(job: BridgeJob) -> BridgeJob:
+        receipt = await job.sender.wait_for_receipt(job.tx_hash)
+        job.sender.report_receipt(job.transaction, receipt)
+        job.status = receipt["status"] == 1
+        return job
+
+    async def bridge(
+            self,
+            sender: SenderModule,
+            amount: float,
+            on_broadcast: Callable[[HexBytes, int], None] = None
+    ) -> tuple[bool, str]:
+        try:
+            job = await self.submit(BridgeJob(sender=sender, amount=amount, on_broadcast=on_broadcast))
+            return job.status, job.tx_hash.hex()
+
+        except Exception as error:
+            return False, str(error)
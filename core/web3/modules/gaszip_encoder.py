@@ -0,0 +1,98 @@
+import asyncio
+import random
+
+from typing import Awaitable, Callable
+
+from loguru import logger
+from web3 import Web3
+
+from core.web3.cache import QuoteCache
+
+
+class GasZipDepositEncoder:
+    """Builds GasZip direct-deposit calldata locally instead of asking the quote API
+
+    A deposit to the GasZip contract carries a one byte mode followed by the recipient for
+    ``RECIPIENT`` deposits and the 2-byte GasZip short id of every destination chain. Local calldata
+    is only sent after it matched the API once, then a ``verify_rate`` share is checked in the
+    background. On a mismatch the encoder turns itself off and the API is used.
+    """
+
+    SELF = 0x01
+    RECIPIENT = 0x02
+
+    def __init__(self, short_ids: dict[int, int], verify_rate: float = 0.02):
+        self.short_ids = short_ids
+        self.verify_rate = verify_rate
+        self.trusted = True
+        self.checked = False
+        self.check_lock = asyncio.Lock()
+        self.checks: set[asyncio.Task] = set()
+        self.encoded = 0
+        self.matches = 0
+        self.mismatches = 0
+        self.check_errors = 0
+
+    def encode(self, chain_ids: list[int], recipient: str = None) -> str:
+        unknown = [chain_id for chain_id in chain_ids if chain_id not in self.short_ids]
+        if unknown:
+            raise Exception(f"No GasZip short id configured for chains {unknown}")
+
+        data = bytes([self.RECIPIENT]) + bytes.fromhex(Web3.to_checksum_address(recipient)[2:]) if recipient \
+            else bytes([self.SELF])
+        for chain_id in chain_ids:
+            data += self.short_ids[chain_id].to_bytes(2, "big")
+
+        self.encoded += 1
+        return "0x" + data.hex()
+
+    @property
+    def ready(self) -> bool:
+        """Local calldata matched the API at least once and never mismatched since"""
+        return self.trusted and self.checked
+
+    async def _check(self, call_data: str, fetch: Callable[[], Awaitable[str]]) -> bool:
+        try:
+            expected = QuoteCache.validate(await fetch())
+        except Exception as e:
+            # An unreachable API says nothing about the encoding
+            self.check_errors += 1
+            logger.warning(f"Cannot cross-check GasZip calldata with the API: {e}")
+            return False
+
+        if expected.lower() == call_data.lower():
+            self.matches += 1
+            self.checked = True
+            return True
+
+        self.mismatches += 1
+        if self.trusted:
+            self.trusted = False
+            logger.error(f"Local GasZip calldata {call_data} does not match the API ({expected[:50]}), using the API from now on")
+        return False
+
+    async def cross_check(self, call_data: str, fetch: Callable[[], Awaitable[str]]) -> bool:
+        """True when the calldata may be sent, blocks until a check against the API succeeded once
+
+        Once the encoding matched, later checks run in the background.
+        """
+        if not self.checked:
+            async with self.check_lock:
+                if not self.checked and not await self._check(call_data, fetch):
+                    return False
+            return self.trusted
+
+        if random.random() < self.verify_rate:
+            task = asyncio.create_task(self._check(call_data, fetch))
+            self.checks.add(task)
+            task.add_done_callback(self.checks.discard)
+        return self.trusted
+
+    def stats(self) -> dict:
+        return {
+            "trusted": self.trusted,
+            "encoded": self.encoded,
+            "matches": self.matches,
+            "mismatches": self.mismatches,
+            "check_errors": self.check_errors,
+        }
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+from typing import TYPE_CHECKING
+
+from httpx import AsyncClient
+from loguru import logger
+
+if TYPE_CHECKING:
+    # Imported for annotations only, the utils package imports models which imports this module
+    from utils.managers.http_client_manager import HttpClientManager
+
+
+class GasZipHealthMonitor:
+    """Probes the GasZip API in the background so wallets read a cached health state"""
+
+    TEST_URL = "https://backend.gas.zip/v2/quotes/56/1000000000000000/204"
+    TEST_PARAMS = {'from': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6', 'to': ''}
+
+    def __init__(
+            self,
+            proxy: str = None,
+            interval: float = 30,
+            retry_interval: float = 5,
+            timeout: float = 10,
+            max_wait: float | None = 300,
+            http_clients: "HttpClientManager" = None,
+    ):
+        self.proxy = proxy
+        self.http_clients = http_clients
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.healthy: bool | None = None
+        self.last_checked = 0.0
+        self.healthy_event = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    async def probe(self) -> bool:
+        try:
+            if self.http_clients:
+                client = await self.http_clients.get_client(self.proxy)
+                response = await client.get(self.TEST_URL, params=self.TEST_PARAMS, timeout=self.timeout)
+            else:
+                async with AsyncClient(proxy=self.proxy, timeout=self.timeout) as client:
+                    response = await client.get(self.TEST_URL, params=self.TEST_PARAMS)
+
+            if response.status_code == 200:
+                logger.debug(f"GasZip API test data: {response.json()}")
+                return True
+
+            logger.error(f"GasZip API test failed: {response.status_code} - {response.text}")
+            return False
+
+        except Exception as e:
+            logger.error(f"GasZip API connection test failed: {e}")
+            return False
+
+    def _update(self, healthy: bool) -> None:
+        if healthy and self.healthy is False:
+            logger.success("GasZip API is reachable again, resuming dispatch")
+        elif not healthy and self.healthy is not False:
+            logger.warning("GasZip API is not accessible, pausing dispatch until it recovers")
+
+        self.healthy = healthy
+        self.last_checked = time.monotonic()
+        if healthy:
+            self.healthy_event.set()
+        else:
+            self.healthy_event.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval if self.healthy else self.retry_interval)
+            self._update(await self.probe())
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None
+
+    async def start(self) -> None:
+        if self.task:
+            return
+
+        self._update(await self.probe())
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.task:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    async def wait_until_healthy(self) -> None:
+        try:
+            await asyncio.wait_for(self.healthy_event.wait(), self.max_wait)
+        except asyncio.TimeoutError:
+            raise Exception(f"GasZip API has been unavailable for more than {self.max_wait} seconds")
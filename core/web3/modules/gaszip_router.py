@@ -0,0 +1,144 @@
+import json
+import time
+
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from loguru import logger
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    @property
+    def available(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        return not self.probe_in_flight
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+
+        if self.state == self.HALF_OPEN and not self.probe_in_flight:
+            # Only one probe request is let through until it reports back
+            self.probe_in_flight = True
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class EndpointStats:
+    successes: int = 0
+    failures: int = 0
+    last_success: float = 0.0
+
+    @property
+    def score(self) -> float:
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+
+class GasZipEndpointRouter:
+    """Orders GasZip quote endpoints by past results and skips the ones that keep failing"""
+
+    API_HOST = "https://backend.gas.zip"
+    ENDPOINT_TEMPLATES = (
+        "https://backend.gas.zip/v2/bridge/56/{value}/{chains}",  # Try bridge endpoint first
+        "https://backend.gas.zip/v2/transaction/56/{value}/{chains}",  # Transaction endpoint
+        "https://backend.gas.zip/v2/build/56/{value}/{chains}",  # Build endpoint
+        "https://backend.gas.zip/v2/quotes/56/{value}/{chains}",  # Original quotes endpoint
+        "https://backend.gas.zip/v2/quotes/bsc/{value}/opbnb",  # Alternative with chain names, opBNB only
+        "https://backend.gas.zip/v2/quotes/bsc/{value}/{chains}",  # Mixed format
+        "https://backend.gas.zip/api/v2/quotes/56/{value}/{chains}",  # Alternative API path
+    )
+
+    def __init__(self, state_path: str | Path = None, failure_threshold: int = 3, reset_timeout: float = 60):
+        self.state_path = Path(state_path) if state_path else None
+        self.stats = {template: EndpointStats() for template in self.ENDPOINT_TEMPLATES}
+        self.breakers = {
+            template: CircuitBreaker(failure_threshold, reset_timeout) for template in self.ENDPOINT_TEMPLATES
+        }
+        self.load()
+
+    def ranked(self) -> list[str]:
+        order = {template: i for i, template in enumerate(self.ENDPOINT_TEMPLATES)}
+        preferred = max(self.stats, key=lambda template: self.stats[template].last_success)
+        if not self.stats[preferred].last_success:
+            preferred = None
+
+        available = [template for template in self.ENDPOINT_TEMPLATES if self.breakers[template].available]
+        return sorted(
+            available,
+            key=lambda template: (template != preferred, -self.stats[template].score, order[template])
+        )
+
+    def allow_request(self, template: str) -> bool:
+        return self.breakers[template].allow_request()
+
+    def record_success(self, template: str) -> None:
+        self.breakers[template].record_success()
+        stats = self.stats[template]
+        stats.successes += 1
+        stats.last_success = time.time()
+
+    def record_failure(self, template: str) -> None:
+        breaker = self.breakers[template]
+        was_open = breaker.state == CircuitBreaker.OPEN
+        breaker.record_failure()
+        self.stats[template].failures += 1
+
+        if breaker.state == CircuitBreaker.OPEN and not was_open:
+            logger.warning(f"GasZip endpoint disabled for {breaker.reset_timeout}s after repeated failures: {template}")
+
+    def load(self) -> None:
+        if not self.state_path or not self.state_path.exists():
+            return
+
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            for template, stats in data.items():
+                if template in self.stats:
+                    self.stats[template] = EndpointStats(**stats)
+        except Exception as e:
+            logger.warning(f"Cannot load GasZip endpoint ranking from {self.state_path}: {e}")
+
+    def save(self) -> None:
+        if not self.state_path:
+            return
+
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {template: asdict(stats) for template, stats in self.stats.items()}
+            self.state_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        except Exception as e:
+            logger.warning(f"Cannot save GasZip endpoint ranking to {self.state_path}: {e}")
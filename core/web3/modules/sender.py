@@ -1,26 +1,62 @@
 import httpx
 import asyncio
 
+from contextlib import asynccontextmanager
+from typing import Any, Callable
 from eth_typing import HexStr
+from hexbytes import HexBytes
 from loguru import logger
 from web3.types import TxParams
 
+from core.web3.modules.gaszip_router import GasZipEndpointRouter
+from core.web3.preflight import WalletSnapshot
+from core.web3.services import Web3Services
 from core.web3.wallet import Web3Wallet
 from httpx import AsyncClient
 
 
 class SenderModule(Web3Wallet):
     BASE_TARGET = "0x391E7C679d29bD940d63be94AD22A25d25b5A604"
+    DESTINATION_CHAIN_ID = 204  # opBNB
 
-    def __init__(self, private_key: str, target_address: str, rpc_url: str, proxy: str = None):
-        super().__init__(private_key, rpc_url, proxy)
+    def __init__(
+            self,
+            private_key: str,
+            target_address: str,
+            rpc_url: str,
+            proxy: str = None,
+            services: Web3Services = None,
+            snapshot: WalletSnapshot = None,
+            address: str = None,
+            destination_chain_ids: list[int] = None,
+    ):
+        super().__init__(private_key, rpc_url, proxy, services, snapshot, address)
         self.proxy = proxy
         self.target_address = target_address
+        # One deposit refuels every destination chain, GasZip splits the value evenly between them
+        self.destination_chain_ids = destination_chain_ids or [self.DESTINATION_CHAIN_ID]
+
+    @property
+    def quote_key(self) -> tuple:
+        return tuple(self.destination_chain_ids), "self"  # deposit to the sending address
+
+    @asynccontextmanager
+    async def http_client(self, timeout: float):
+        # Pooled clients are borrowed from the shared manager and never closed here
+        if self.services.http_clients:
+            yield await self.services.http_clients.get_client(self.proxy)
+        else:
+            async with AsyncClient(proxy=self.proxy, timeout=timeout) as client:
+                yield client
 
     async def test_gaszip_connection(self) -> bool:
         """Test if GasZip API is accessible and responding"""
+        monitor = self.services.gaszip_health
+        if monitor and monitor.running:
+            return bool(monitor.healthy)
+
         try:
-            async with AsyncClient(proxy=self.proxy, timeout=10) as client:
+            async with self.http_client(timeout=10) as client:
                 # Test with a simple endpoint first
                 test_url = "https://backend.gas.zip/v2/quotes/56/1000000000000000/204"
                 response = await client.get(test_url, params={'from': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6', 'to': ''})
@@ -39,30 +75,49 @@ class SenderModule(Web3Wallet):
             return False
 
     async def create_quote(self, value: int) -> str:
+        encoder = self.services.deposit_encoder
+        if encoder and encoder.trusted:
+            try:
+                call_data = encoder.encode(self.destination_chain_ids)
+            except Exception as e:
+                encoder.trusted = False
+                logger.warning(f"Cannot encode GasZip calldata locally, using the API from now on: {e}")
+            else:
+                # Unchecked calldata is never sent, the API quote is used until a check succeeded
+                if await encoder.cross_check(call_data, lambda: self.request_quote(value)):
+                    return call_data
+
+        # The calldata only depends on the destination chain and the recipient, not on the amount
+        if self.services.quote_cache:
+            return await self.services.quote_cache.call_data(self.quote_key, lambda: self.request_quote(value))
+        return await self.request_quote(value)
+
+    async def request_quote(self, value: int) -> str:
+        router = self.services.quote_router or GasZipEndpointRouter()
+
         for attempt in range(3):
             try:
-                async with AsyncClient(proxy=self.proxy, timeout=15) as client:
-                    # For BNB bridging to opBNB, we need to specify the destination chain (204 = opBNB)
+                async with self.http_client(timeout=15) as client:
+                    # Destination chains are part of the endpoint path (204 = opBNB)
                     # The 'to' parameter should be empty or the user's opBNB address if they want to bridge to a specific address
                     params = {
                         'from': self.wallet_address,
                         'to': '',  # Empty for self-bridging to opBNB
                     }
 
-                    # Try different API endpoints - GasZip might have changed their API structure
-                    api_endpoints = [
-                        f'https://backend.gas.zip/v2/bridge/56/{value}/204',  # Try bridge endpoint first
-                        f'https://backend.gas.zip/v2/transaction/56/{value}/204',  # Transaction endpoint
-                        f'https://backend.gas.zip/v2/build/56/{value}/204',  # Build endpoint
-                        f'https://backend.gas.zip/v2/quotes/56/{value}/204',  # Original quotes endpoint
-                        f'https://backend.gas.zip/v2/quotes/bsc/{value}/opbnb',  # Alternative with chain names
-                        f'https://backend.gas.zip/v2/quotes/bsc/{value}/204',  # Mixed format
-                        f'https://backend.gas.zip/api/v2/quotes/56/{value}/204',  # Alternative API path
-                    ]
-                    
-                    last_error = None
-                    
-                    for endpoint in api_endpoints:
+                    # GasZip might have changed their API structure, so the router tries the endpoint
+                    # that last returned calldata first and skips the ones that keep failing
+                    last_error = "No GasZip API endpoint is available, all circuit breakers are open"
+
+                    chains = ",".join(str(chain_id) for chain_id in self.destination_chain_ids)
+                    for template in router.ranked():
+                        # Templates with a fixed destination only fit a deposit to that chain alone
+                        if "{chains}" not in template and self.destination_chain_ids != [self.DESTINATION_CHAIN_ID]:
+                            continue
+                        if not router.allow_request(template):
+                            continue
+
+                        endpoint = template.format(value=value, chains=chains)
                         try:
                             logger.debug(f"Trying GasZip API endpoint: {endpoint}")
                             logger.debug(f"Parameters: {params}")
@@ -76,10 +131,12 @@ class SenderModule(Web3Wallet):
                                 # Check for API errors first
                                 if 'error' in data:
                                     last_error = f"GasZip API error: {data['error']}"
+                                    router.record_failure(template)
                                     continue
                                 
                                 if 'message' in data and 'error' in data.get('message', '').lower():
                                     last_error = f"GasZip API error: {data['message']}"
+                                    router.record_failure(template)
                                     continue
                                 
                                 # Look for calldata in the response
@@ -89,18 +146,22 @@ class SenderModule(Web3Wallet):
                                     call_data = data.get('callData') or data.get('data') or data.get('tx_data')
                                     
                                 if call_data:
+                                    router.record_success(template)
                                     logger.info(f"Successfully got quote from endpoint: {endpoint}")
                                     return call_data
                                 else:
                                     last_error = f"Response missing calldata: {data}"
+                                    router.record_failure(template)
                                     continue
                                     
                             else:
                                 last_error = f"HTTP {response.status_code}: {response.text}"
+                                router.record_failure(template)
                                 continue
                                 
                         except Exception as e:
                             last_error = f"Endpoint {endpoint} failed: {e}"
+                            router.record_failure(template)
                             continue
                     
                     # If we get here, all endpoints failed
@@ -127,15 +188,31 @@ class SenderModule(Web3Wallet):
         # If we get here, all attempts failed
         raise Exception("Failed to create quote after 3 attempts")
 
-    async def _build_trx(self, amount: float) -> TxParams:
+    async def ensure_gaszip_available(self) -> None:
+        # Locally encoded deposits do not need the API once the encoding was checked
+        if self.services.deposit_encoder and self.services.deposit_encoder.ready:
+            return
+
+        # A running health monitor already probes the API for every wallet
+        monitor = self.services.gaszip_health
+        if monitor and monitor.running:
+            await monitor.wait_until_healthy()
+            return
+
+        logger.info(f"Testing GasZip API connection for wallet {self.wallet_address}")
+        if not await self.test_gaszip_connection():
+            raise Exception("GasZip API is not accessible")
+
+    async def _build_trx(self, amount: float, call_data: str = None) -> TxParams:
         try:
             value = int(self.to_wei(amount, "ether"))
             logger.debug(f"Building transaction for {amount} BNB ({value} wei)")
             
-            call_data = await self.create_quote(value)
+            if call_data is None:
+                call_data = await self.create_quote(value)
             logger.debug(f"Got calldata: {call_data[:50]}...")
             
-            gas_price = await self.eth.gas_price
+            gas_price = await self.current_gas_price()
             logger.debug(f"Gas price: {gas_price}")
             
             # Estimate gas for the transaction
@@ -147,11 +224,16 @@ class SenderModule(Web3Wallet):
             }
             logger.debug(f"Estimating gas with params: {gas_estimate_params}")
             
-            gas_limit = await self.eth.estimate_gas(gas_estimate_params)
+            if self.services.gas_limits:
+                gas_limit = await self.services.gas_limits.gas_limit(
+                    gas_estimate_params, lambda: self.eth.estimate_gas(gas_estimate_params)
+                )
+            else:
+                gas_limit = await self.eth.estimate_gas(gas_estimate_params)
             logger.debug(f"Estimated gas limit: {gas_limit}")
             
             transaction = {
-                "chainId": await self.eth.chain_id,
+                "chainId": await self.current_chain_id(),
                 "data": HexStr(call_data),
                 "from": self.wallet_address,
                 "to": self.to_checksum_address(self.BASE_TARGET),
@@ -168,16 +250,35 @@ class SenderModule(Web3Wallet):
             logger.error(f"Error building transaction: {e}")
             raise
 
-    async def process_bridge(self, amount: float) -> tuple[bool, str]:
+    def report_receipt(self, transaction: TxParams, receipt: Any) -> None:
+        if self.services.quote_cache and receipt["status"] != 1:
+            # A reverted deposit may come from stale calldata, the next build asks GasZip again
+            self.services.quote_cache.invalidate(self.quote_key)
+        if self.services.gas_limits and receipt["status"] != 1 and receipt["gasUsed"] >= transaction["gas"]:
+            logger.warning(f"Wallet: {self.wallet_address} | Transaction ran out of gas, the next ones use a live gas estimate")
+            self.services.gas_limits.report_receipt(transaction, receipt)
+
+    async def prepare_transaction(self, amount: float, call_data: str = None) -> TxParams:
+        transaction = await self._build_trx(amount, call_data)
         try:
-            # Test GasZip API connection first
-            logger.info(f"Testing GasZip API connection for wallet {self.wallet_address}")
-            if not await self.test_gaszip_connection():
-                return False, "GasZip API is not accessible"
-            
-            transaction = await self._build_trx(amount)
             await self.check_trx_availability(transaction)
-            return await self._process_transaction(transaction)
+        except Exception:
+            self.release_nonce(transaction)
+            raise
+
+        return transaction
+
+    async def process_bridge(self, amount: float, on_broadcast: Callable[[HexBytes, int], None] = None) -> tuple[bool, str]:
+        try:
+            await self.ensure_gaszip_available()
+            transaction = await self.prepare_transaction(amount)
+
+            tx_hash = await self.broadcast_transaction(transaction)
+            if on_broadcast:
+                on_broadcast(tx_hash, transaction["nonce"])
+            receipt = await self.wait_for_receipt(tx_hash)
+            self.report_receipt(transaction, receipt)
+            return receipt["status"] == 1, tx_hash.hex()
 
         except Exception as error:
             return False, str(error)
@@ -0,0 +1,97 @@
+import asyncio
+
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.eth import AsyncEth
+
+from core.web3.services import Web3Services
+
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
+# getEthBalance(address)
+GET_ETH_BALANCE_SELECTOR = bytes.fromhex("4d2301cc")
+
+
+class BalanceScanner:
+    """Reads native balances of many addresses through Multicall3 getEthBalance aggregated eth_calls"""
+
+    def __init__(
+            self,
+            rpc_url: str,
+            proxy: str = None,
+            services: Web3Services = None,
+            batch_size: int = 1000,
+            max_concurrent_calls: int = 4,
+    ):
+        services = services or Web3Services()
+        self.web3 = AsyncWeb3(provider=services.create_provider(rpc_url, proxy), modules={"eth": (AsyncEth,)})
+        self.multicall = self.web3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        self.batch_size = batch_size
+        self.semaphore = asyncio.Semaphore(max_concurrent_calls)
+
+    @staticmethod
+    def _encode_balance_call(address: str) -> tuple[str, bool, bytes]:
+        call_data = GET_ETH_BALANCE_SELECTOR + bytes(12) + bytes.fromhex(address[2:])
+        return MULTICALL3_ADDRESS, True, call_data
+
+    async def _scan_chunk(self, addresses: list[str]) -> dict[str, int]:
+        async with self.semaphore:
+            results = await self.multicall.functions.aggregate3(
+                [self._encode_balance_call(address) for address in addresses]
+            ).call()
+
+        balances = {}
+        for address, (success, return_data) in zip(addresses, results):
+            if success:
+                balances[address] = int.from_bytes(return_data, "big")
+
+        return balances
+
+    async def scan(self, addresses: list[str]) -> dict[str, int]:
+        chunks = [addresses[i:i + self.batch_size] for i in range(0, len(addresses), self.batch_size)]
+        results = await asyncio.gather(*(self._scan_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+        balances = {}
+        for chunk, result in zip(chunks, results):
+            # Addresses of a failed chunk stay unread, the bot keeps them and the sender checks them later
+            if isinstance(result, Exception):
+                logger.warning(f"Balance scan chunk of {len(chunk)} addresses failed | Error: {result}")
+                continue
+            balances.update(result)
+
+        logger.info(f"Balance scan read {len(balances)}/{len(addresses)} balances in {len(chunks)} multicall requests")
+        return balances
+
+    async def gas_price(self) -> int:
+        return await self.web3.eth.gas_price
@@ -0,0 +1,87 @@
+import asyncio
+import heapq
+
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+
+@dataclass
+class AddressNonces:
+    next_nonce: int
+    released: list[int] = field(default_factory=list)
+    pending: set[int] = field(default_factory=set)
+    highest_broadcast: int = -1
+
+
+class NonceManager:
+    """Hands out nonces locally after seeding each address once from chain
+
+    Nonces of transactions that failed before being broadcast are released and handed out
+    again first, so later transactions do not stay stuck behind the gap.
+    """
+
+    def __init__(self):
+        self.addresses: dict[str, AddressNonces] = {}
+        self.locks: dict[str, asyncio.Lock] = {}
+
+    async def reserve(self, address: str, fetch: Callable[[], Awaitable[int]]) -> int:
+        lock = self.locks.setdefault(address, asyncio.Lock())
+        async with lock:
+            state = self.addresses.get(address)
+            if state is None:
+                state = AddressNonces(next_nonce=await fetch())
+                self.addresses[address] = state
+
+            if state.released:
+                nonce = heapq.heappop(state.released)
+            else:
+                nonce = state.next_nonce
+                state.next_nonce += 1
+
+            state.pending.add(nonce)
+            return nonce
+
+    def confirm(self, address: str, nonce: int) -> None:
+        state = self.addresses.get(address)
+        if state is None:
+            return
+
+        state.pending.discard(nonce)
+        state.highest_broadcast = max(state.highest_broadcast, nonce)
+
+    def release(self, address: str, nonce: int) -> None:
+        state = self.addresses.get(address)
+        if state is None or nonce not in state.pending:
+            return
+
+        state.pending.discard(nonce)
+        heapq.heappush(state.released, nonce)
+
+    def claim(self, address: str, nonce: int) -> bool:
+        """Takes a specific released nonce, used to fill gaps"""
+        state = self.addresses.get(address)
+        if state is None or nonce not in state.released:
+            return False
+
+        state.released.remove(nonce)
+        heapq.heapify(state.released)
+        state.pending.add(nonce)
+        return True
+
+    def gaps(self, address: str) -> list[int]:
+        """Released nonces below an already broadcast one, these block the mempool until filled"""
+        state = self.addresses.get(address)
+        if state is None:
+            return []
+        return sorted(nonce for nonce in state.released if nonce < state.highest_broadcast)
+
+    def forget(self, address: str) -> None:
+        """Drops the state of a finished wallet, a streaming run would otherwise keep every address"""
+        self.addresses.pop(address, None)
+        self.locks.pop(address, None)
+
+    def resync(self, address: str) -> None:
+        if self.addresses.pop(address, None) is not None:
+            logger.debug(f"Nonce state for {address} dropped, it will be re-seeded from chain")
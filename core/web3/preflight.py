@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+from dataclasses import dataclass, field
+
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.eth import AsyncEth
+
+from core.web3.services import Web3Services
+
+
+@dataclass
+class WalletSnapshot:
+    address: str
+    balance: int
+    nonce: int
+    gas_price: int
+    chain_id: int
+    max_age: float = 300
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.fetched_at <= self.max_age
+
+
+class PreflightScanner:
+    """Fetches balances, nonces, gas price and chain id for many wallets via JSON-RPC batches"""
+
+    def __init__(
+            self,
+            rpc_url: str,
+            proxy: str = None,
+            services: Web3Services = None,
+            batch_size: int = 100,
+            max_age: float = 300,
+            max_concurrent_batches: int = 4,
+    ):
+        services = services or Web3Services()
+        self.web3 = AsyncWeb3(provider=services.create_provider(rpc_url, proxy), modules={"eth": (AsyncEth,)})
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.semaphore = asyncio.Semaphore(max_concurrent_batches)
+
+    async def _fetch_chain_values(self) -> tuple[int, int]:
+        async with self.web3.batch_requests() as batch:
+            batch.add(self.web3.eth.gas_price)
+            batch.add(self.web3.eth.chain_id)
+            gas_price, chain_id = await batch.async_execute()
+
+        return gas_price, chain_id
+
+    async def _fetch_chunk(self, addresses: list[str], gas_price: int, chain_id: int) -> dict[str, WalletSnapshot]:
+        async with self.semaphore:
+            try:
+                async with self.web3.batch_requests() as batch:
+                    for address in addresses:
+                        batch.add(self.web3.eth.get_balance(address))
+                        batch.add(self.web3.eth.get_transaction_count(address))
+
+                    results = await batch.async_execute()
+
+            except Exception as e:
+                logger.warning(f"Pre-flight batch of {len(addresses)} wallets failed, they will use live RPC reads | Error: {e}")
+                return {}
+
+        snapshots = {}
+        for i, address in enumerate(addresses):
+            snapshots[address] = WalletSnapshot(
+                address=address,
+                balance=results[i * 2],
+                nonce=results[i * 2 + 1],
+                gas_price=gas_price,
+                chain_id=chain_id,
+                max_age=self.max_age,
+            )
+
+        return snapshots
+
+    async def fetch(self, addresses: list[str]) -> dict[str, WalletSnapshot]:
+        if not addresses:
+            return {}
+
+        try:
+            gas_price, chain_id = await self._fetch_chain_values()
+        except Exception as e:
+            logger.warning(f"Pre-flight could not fetch gas price and chain id, skipping | Error: {e}")
+            return {}
+
+        chunks = [addresses[i:i + self.batch_size] for i in range(0, len(addresses), self.batch_size)]
+        results = await asyncio.gather(*(self._fetch_chunk(chunk, gas_price, chain_id) for chunk in chunks))
+
+        snapshots = {}
+        for result in results:
+            snapshots.update(result)
+
+        logger.info(f"Pre-flight fetched {len(snapshots)}/{len(addresses)} wallet snapshots in {len(chunks) + 1} batch requests")
+        return snapshots
@@ -0,0 +1,88 @@
+import asyncio
+
+from hexbytes import HexBytes
+from loguru import logger
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt
+
+from core.web3.block_watcher import BlockWatcher
+
+
+class ReceiptTracker:
+    """Resolves receipts of all pending transactions with batched requests once per new block
+
+    Waiting tasks get a shared future per transaction hash, so polling traffic follows the block
+    rate instead of growing with the number of transactions in flight.
+    """
+
+    def __init__(self, block_watcher: BlockWatcher, batch_size: int = 100, timeout: float = 120):
+        self.block_watcher = block_watcher
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.pending: dict[str, asyncio.Future] = {}
+        self.waiters: dict[str, int] = {}
+        self.batches = 0
+        self.resolved = 0
+        self.block_watcher.subscribe(self.on_block)
+
+    @property
+    def running(self) -> bool:
+        return self.block_watcher.running
+
+    async def wait(self, tx_hash: HexBytes | str, timeout: float = None) -> TxReceipt:
+        tx_hash = HexBytes(tx_hash).to_0x_hex()
+        future = self.pending.get(tx_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.pending[tx_hash] = future
+        self.waiters[tx_hash] = self.waiters.get(tx_hash, 0) + 1
+
+        timeout = timeout or self.timeout
+        try:
+            # Shielded so one waiter timing out does not cancel the receipt for the others
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(f"Transaction {tx_hash} is not in the chain after {timeout} seconds")
+        finally:
+            self.waiters[tx_hash] -= 1
+            if not self.waiters[tx_hash]:
+                self.waiters.pop(tx_hash)
+                if self.pending.get(tx_hash) is future:
+                    self.pending.pop(tx_hash)
+
+    async def _fetch_chunk(self, hashes: list[str]) -> None:
+        provider = self.block_watcher.web3.provider
+        responses = await provider.make_batch_request([("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes])
+        self.batches += 1
+
+        if not isinstance(responses, list):
+            raise Exception(f"Batch receipt request failed: {responses.get('error', responses)}")
+
+        for tx_hash, response in zip(hashes, responses):
+            receipt = response.get("result")
+            future = self.pending.get(tx_hash)
+            if not receipt or future is None or future.done():
+                continue
+
+            future.set_result(AttributeDict.recursive(receipt_formatter(receipt)))
+            self.resolved += 1
+
+    async def on_block(self, block_number: int) -> None:
+        hashes = [tx_hash for tx_hash, future in self.pending.items() if not future.done()]
+        if not hashes:
+            return
+
+        chunks = [hashes[i:i + self.batch_size] for i in range(0, len(hashes), self.batch_size)]
+        results = await asyncio.gather(*(self._fetch_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Block {block_number} | Receipt batch failed, retrying on the next block | Error: {result}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self.pending),
+            "resolved": self.resolved,
+            "batch_requests": self.batches,
+        }
@@ -0,0 +1,157 @@
+import random
+import time
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from aiohttp import ClientConnectorError
+from loguru import logger
+from web3 import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from core.web3.modules.gaszip_router import CircuitBreaker
+
+
+@dataclass
+class RpcEndpoint:
+    url: str
+    breaker: CircuitBreaker
+    latency: float | None = None
+    error_rate: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    last_error: str | None = field(default=None, repr=False)
+
+
+class RpcRouter:
+    """Tracks live latency and error rate per RPC endpoint and picks one per request
+
+    Endpoints are chosen at random weighted by ``(1 - error_rate) / latency``, so the fastest
+    healthy endpoint gets most reads while the others keep getting enough traffic to be measured.
+    Endpoints failing ``failure_threshold`` times in a row are skipped for ``reset_timeout`` seconds.
+    """
+
+    RATE_LIMIT_MARKERS = ("rate limit", "limit exceeded", "too many requests", "capacity")
+
+    def __init__(self, urls: list[str], failure_threshold: int = 3, reset_timeout: float = 30, smoothing: float = 0.2):
+        self.endpoints = {
+            url: RpcEndpoint(url=url, breaker=CircuitBreaker(failure_threshold, reset_timeout)) for url in urls
+        }
+        self.smoothing = smoothing
+
+    @property
+    def urls(self) -> list[str]:
+        return list(self.endpoints)
+
+    def _weight(self, endpoint: RpcEndpoint) -> float:
+        measured = [e.latency for e in self.endpoints.values() if e.latency is not None]
+        # Endpoints without samples yet are weighted like an average one so they get measured
+        latency = endpoint.latency if endpoint.latency is not None else (sum(measured) / len(measured) if measured else 0.1)
+        return max(1.0 - endpoint.error_rate, 0.05) / max(latency, 0.001)
+
+    def pick(self, exclude: set[str] = None) -> str:
+        candidates = [
+            endpoint for endpoint in self.endpoints.values()
+            if endpoint.url not in (exclude or ()) and endpoint.breaker.available
+        ]
+        if not candidates:
+            # Every endpoint is failing, still try the ones not tried for this request
+            candidates = [endpoint for endpoint in self.endpoints.values() if endpoint.url not in (exclude or ())]
+        if not candidates:
+            raise Exception("No RPC endpoint left to try")
+
+        endpoint = random.choices(candidates, weights=[self._weight(e) for e in candidates])[0]
+        endpoint.breaker.allow_request()
+        return endpoint.url
+
+    def record_success(self, url: str, latency: float) -> None:
+        endpoint = self.endpoints[url]
+        endpoint.requests += 1
+        endpoint.breaker.record_success()
+        endpoint.latency = latency if endpoint.latency is None else endpoint.latency * (1 - self.smoothing) + latency * self.smoothing
+        endpoint.error_rate *= 1 - self.smoothing
+
+    def record_failure(self, url: str, error: str) -> None:
+        endpoint = self.endpoints[url]
+        was_open = endpoint.breaker.state == CircuitBreaker.OPEN
+        endpoint.requests += 1
+        endpoint.failures += 1
+        endpoint.last_error = error
+        endpoint.breaker.record_failure()
+        endpoint.error_rate = endpoint.error_rate * (1 - self.smoothing) + self.smoothing
+
+        if endpoint.breaker.state == CircuitBreaker.OPEN and not was_open:
+            logger.warning(f"RPC endpoint disabled for {endpoint.breaker.reset_timeout}s after repeated failures: {url} | Error: {error}")
+
+    def is_rate_limited(self, response: Any) -> bool:
+        if isinstance(response, list):
+            return any(self.is_rate_limited(item) for item in response)
+        if not isinstance(response, dict) or "error" not in response:
+            return False
+
+        message = str(response["error"]).lower()
+        return any(marker in message for marker in self.RATE_LIMIT_MARKERS)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            url: {
+                "requests": endpoint.requests,
+                "failures": endpoint.failures,
+                "latency": round(endpoint.latency, 3) if endpoint.latency is not None else None,
+                "error_rate": round(endpoint.error_rate, 3),
+                "state": endpoint.breaker.state,
+            }
+            for url, endpoint in self.endpoints.items()
+        }
+
+
+class RoutedHTTPProvider(AsyncHTTPProvider):
+    """Sends each request to the endpoint picked by the router and fails over to the next one on errors"""
+
+    WRITE_METHODS = ("eth_sendRawTransaction", "eth_sendTransaction")
+
+    def __init__(self, router: RpcRouter, create_provider: Callable[[str], AsyncHTTPProvider], **kwargs):
+        super().__init__(endpoint_uri=router.urls[0], **kwargs)
+        self.router = router
+        self.providers = {url: create_provider(url) for url in router.urls}
+
+    async def _route(self, request: Callable[[AsyncHTTPProvider], Awaitable[Any]], write: bool = False) -> Any:
+        tried = set()
+        while True:
+            url = self.router.pick(exclude=tried)
+            tried.add(url)
+            started = time.monotonic()
+
+            try:
+                response = await request(self.providers[url])
+            except Exception as e:
+                self.router.record_failure(url, str(e) or type(e).__name__)
+                # A write is only retried elsewhere when it never reached the endpoint
+                if len(tried) >= len(self.providers) or (write and not isinstance(e, ClientConnectorError)):
+                    raise
+                continue
+
+            if self.router.is_rate_limited(response):
+                self.router.record_failure(url, str(response))
+                if len(tried) < len(self.providers) and not write:
+                    continue
+                return response
+
+            self.router.record_success(url, time.monotonic() - started)
+            return response
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return await self._route(
+            lambda provider: provider.make_request(method, params),
+            write=method in self.WRITE_METHODS
+        )
+
+    async def make_batch_request(self, batch_requests: list[tuple[RPCEndpoint, Any]]) -> list[RPCResponse] | RPCResponse:
+        return await self._route(
+            lambda provider: provider.make_batch_request(batch_requests),
+            write=any(method in self.WRITE_METHODS for method, _ in batch_requests)
+        )
+
+    async def disconnect(self) -> None:
+        for provider in self.providers.values():
+            await provider.disconnect()
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from web3 import AsyncHTTPProvider
+
+from core.web3.cache import GasLimitCache, QuoteCache, RpcCache
+from core.web3.modules.gaszip_encoder import GasZipDepositEncoder
+from core.web3.modules.gaszip_health import GasZipHealthMonitor
+from core.web3.modules.gaszip_router import GasZipEndpointRouter
+from core.web3.nonce_manager import NonceManager
+from core.web3.rpc_router import RpcRouter, RoutedHTTPProvider
+from core.web3.session_pool import RpcSessionPool, PooledHTTPProvider
+from core.web3.signer import SignerService
+
+if TYPE_CHECKING:
+    from core.web3.gas_oracle import GasOracle
+    from core.web3.receipt_tracker import ReceiptTracker
+    from utils.managers.concurrency_limiter import AdaptiveConcurrencyLimiter
+    from utils.managers.http_client_manager import HttpClientManager
+    from utils.managers.rate_limiter import RateLimiter
+
+
+@dataclass
+class Web3Services:
+    """Shared, process-wide components handed to every wallet of a run"""
+
+    session_pool: RpcSessionPool | None = None
+    rpc_cache: RpcCache | None = None
+    gas_limits: GasLimitCache | None = None
+    quote_cache: QuoteCache | None = None
+    deposit_encoder: GasZipDepositEncoder | None = None
+    quote_router: GasZipEndpointRouter | None = None
+    gaszip_health: GasZipHealthMonitor | None = None
+    http_clients: "HttpClientManager | None" = None
+    rate_limiter: "RateLimiter | None" = None
+    concurrency: "AdaptiveConcurrencyLimiter | None" = None
+    nonce_manager: NonceManager | None = None
+    signer: SignerService | None = None
+    rpc_router: RpcRouter | None = None
+    # Assigned after construction, both follow blocks through a provider created by these services
+    receipt_tracker: "ReceiptTracker | None" = None
+    gas_oracle: "GasOracle | None" = None
+
+    def _create_endpoint_provider(self, rpc_url: str, proxy: str = None, **kwargs) -> AsyncHTTPProvider:
+        request_kwargs = {
+            "proxy": proxy if proxy else None,
+            "ssl": False
+        }
+
+        if self.session_pool or self.rate_limiter or self.concurrency:
+            return PooledHTTPProvider(
+                endpoint_uri=rpc_url,
+                session_pool=self.session_pool,
+                proxy=proxy,
+                rate_limiter=self.rate_limiter,
+                observer=self.concurrency,
+                request_kwargs=request_kwargs,
+                **kwargs
+            )
+
+        return AsyncHTTPProvider(endpoint_uri=rpc_url, request_kwargs=request_kwargs, **kwargs)
+
+    def create_provider(self, rpc_url: str, proxy: str = None) -> AsyncHTTPProvider:
+        if self.rpc_router and len(self.rpc_router.endpoints) > 1:
+            # Failover between endpoints replaces web3's own retries against a single one
+            return RoutedHTTPProvider(
+                self.rpc_router,
+                lambda url: self._create_endpoint_provider(url, proxy, exception_retry_configuration=None)
+            )
+
+        return self._create_endpoint_provider(rpc_url, proxy)
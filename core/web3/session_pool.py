@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+from functools import partial
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from aiohttp import ClientResponseError, ClientSession, ClientTimeout, TCPConnector
+from eth_typing import URI
+from loguru import logger
+from web3 import AsyncHTTPProvider
+from web3._utils.http_session_manager import HTTPSessionManager
+from web3.types import RPCEndpoint, RPCResponse
+
+if TYPE_CHECKING:
+    from utils.managers.concurrency_limiter import AdaptiveConcurrencyLimiter
+    from utils.managers.rate_limiter import RateLimiter
+
+
+class RpcSessionPool:
+    """Process-wide keep-alive aiohttp sessions keyed by (rpc_url, proxy)"""
+
+    def __init__(self, pool_size: int = 100, idle_timeout: float = 60):
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.lock = asyncio.Lock()
+        self.sessions: dict[tuple[str, str | None], ClientSession] = {}
+        self.last_used: dict[tuple[str, str | None], float] = {}
+        self.created = 0
+        self.acquired = 0
+
+    def _create_session(self) -> ClientSession:
+        connector = TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_size,
+            keepalive_timeout=self.idle_timeout,
+            ttl_dns_cache=300,
+            ssl=False,
+        )
+        self.created += 1
+        return ClientSession(connector=connector, raise_for_status=True, timeout=ClientTimeout(total=30))
+
+    async def _evict_idle(self, now: float) -> None:
+        for key, last_used in list(self.last_used.items()):
+            if now - last_used < self.idle_timeout:
+                continue
+
+            session = self.sessions.pop(key, None)
+            self.last_used.pop(key, None)
+            if session and not session.closed:
+                await session.close()
+                logger.debug(f"Closed idle RPC session: {key[0]} | Proxy: {key[1]}")
+
+    async def get_session(self, rpc_url: str, proxy: str = None) -> ClientSession:
+        key = (str(rpc_url), proxy or None)
+
+        async with self.lock:
+            now = time.monotonic()
+            await self._evict_idle(now)
+
+            session = self.sessions.get(key)
+            if session is None or session.closed:
+                session = self._create_session()
+                self.sessions[key] = session
+
+            self.last_used[key] = now
+            self.acquired += 1
+            return session
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "open_sessions": len(self.sessions),
+            "created_sessions": self.created,
+            "acquired": self.acquired,
+            "reused": self.acquired - self.created,
+        }
+
+    async def close(self) -> None:
+        async with self.lock:
+            for session in self.sessions.values():
+                if not session.closed:
+                    await session.close()
+
+            if self.sessions:
+                logger.info(f"Closed {len(self.sessions)} pooled RPC sessions | Stats: {self.stats()}")
+
+            self.sessions.clear()
+            self.last_used.clear()
+
+
+class PooledSessionManager(HTTPSessionManager):
+    def __init__(self, session_pool: RpcSessionPool, proxy: str = None):
+        super().__init__()
+        self.pool = session_pool
+        self.proxy = proxy
+
+    async def async_cache_and_return_session(
+            self,
+            endpoint_uri: URI,
+            session: ClientSession = None,
+            request_timeout: ClientTimeout = None,
+    ) -> ClientSession:
+        return await self.pool.get_session(endpoint_uri, self.proxy)
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider that borrows sessions from a shared pool and passes requests through a rate limiter"""
+
+    def __init__(
+            self,
+            endpoint_uri: str,
+            session_pool: RpcSessionPool = None,
+            proxy: str = None,
+            rate_limiter: "RateLimiter" = None,
+            observer: "AdaptiveConcurrencyLimiter" = None,
+            **kwargs
+    ):
+        super().__init__(endpoint_uri=endpoint_uri, **kwargs)
+        self.session_pool = session_pool
+        self.rate_limiter = rate_limiter
+        self.observer = observer
+        if session_pool:
+            self._request_session_manager = PooledSessionManager(session_pool, proxy)
+
+    async def _observe(self, request: Callable[[], Awaitable[Any]], cost: int = 1) -> Any:
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(self.endpoint_uri, cost=cost)
+
+        started = time.monotonic()
+        try:
+            response = await request()
+        except (asyncio.TimeoutError, TimeoutError):
+            if self.observer:
+                self.observer.record(error=self.observer.TIMEOUT)
+            raise
+        except ClientResponseError as e:
+            if self.observer and e.status == 429:
+                self.observer.record(error=self.observer.THROTTLED)
+            raise
+
+        if self.observer:
+            self.observer.record(latency=time.monotonic() - started)
+        return response
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return await self._observe(partial(super().make_request, method, params))
+
+    async def make_batch_request(self, batch_requests: list[tuple[RPCEndpoint, Any]]) -> list[RPCResponse] | RPCResponse:
+        return await self._observe(partial(super().make_batch_request, batch_requests), cost=len(batch_requests))
+
+    async def disconnect(self) -> None:
+        # Pooled sessions belong to the pool and are closed once per run
+        if not self.session_pool:
+            await super().disconnect()
@@ -0,0 +1,120 @@
+import asyncio
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from loguru import logger
+
+
+def derive_addresses(private_keys: list[str]) -> list[str]:
+    return [Account.from_key(private_key).address for private_key in private_keys]
+
+
+def sign_transactions(items: list[tuple[str, dict]]) -> list[SignedTransaction | str]:
+    results = []
+    for private_key, transaction in items:
+        try:
+            results.append(Account.sign_transaction(transaction, private_key))
+        except Exception as e:
+            # Errors are returned as text so a bad transaction does not fail the whole batch
+            results.append(f"{type(e).__name__}: {e}")
+    return results
+
+
+class SignerService:
+    """Derives addresses and signs transactions in a process pool, off the event loop
+
+    Signing requests arriving within ``batch_window`` seconds are sent to a worker process
+    together, up to ``batch_size`` per batch.
+    """
+
+    def __init__(self, workers: int = None, batch_size: int = 50, batch_window: float = 0.005):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.executor: ProcessPoolExecutor | None = None
+        self.pending: list[tuple[str, dict, asyncio.Future]] = []
+        self.flush_handle: asyncio.TimerHandle | None = None
+        self.batches: set[asyncio.Task] = set()
+        self.signed = 0
+        self.batch_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self.executor is not None
+
+    async def start(self) -> None:
+        if not self.executor:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            logger.info(f"Signer service started with {self.workers} worker processes")
+
+    async def stop(self) -> None:
+        if not self.executor:
+            return
+
+        self._flush()
+        if self.batches:
+            await asyncio.gather(*self.batches, return_exceptions=True)
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.executor = None
+
+    async def derive_addresses(self, private_keys: list[str]) -> list[str]:
+        loop = asyncio.get_running_loop()
+        chunk_size = max(self.batch_size, -(-len(private_keys) // self.workers))
+        chunks = [private_keys[i:i + chunk_size] for i in range(0, len(private_keys), chunk_size)]
+
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, derive_addresses, chunk) for chunk in chunks
+        ))
+        return [address for chunk in results for address in chunk]
+
+    async def sign(self, private_key: str, transaction: Any) -> SignedTransaction:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((private_key, dict(transaction), future))
+
+        if len(self.pending) >= self.batch_size:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self.flush_handle:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if not self.pending:
+            return
+
+        batch, self.pending = self.pending, []
+        task = asyncio.create_task(self._sign_batch(batch))
+        self.batches.add(task)
+        task.add_done_callback(self.batches.discard)
+
+    async def _sign_batch(self, batch: list[tuple[str, dict, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.executor, sign_transactions, [(private_key, transaction) for private_key, transaction, _ in batch]
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(Exception(f"Signer process failed: {e}"))
+            return
+
+        self.batch_count += 1
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, str):
+                future.set_exception(Exception(f"Cannot sign transaction: {result}"))
+            else:
+                self.signed += 1
+                future.set_result(result)
+
+    def stats(self) -> dict[str, int]:
+        return {"workers": self.workers, "signed": self.signed, "batches": self.batch_count}
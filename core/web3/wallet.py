@@ -1,56 +1,128 @@
+import asyncio
+
 from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
 from eth_typing import ChecksumAddress
+from hexbytes import HexBytes
 
-from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3 import AsyncWeb3
 from web3.eth import AsyncEth
-from web3.types import Nonce, TxParams
+from web3.exceptions import TransactionNotFound
+from web3.types import Nonce, TxParams, TxReceipt
 
+from functools import cached_property
 from typing import Any
 from loguru import logger
 
+from core.web3.nonce_manager import NonceManager
+from core.web3.preflight import WalletSnapshot
+from core.web3.services import Web3Services
 
 
 
 
 class Web3Wallet(AsyncWeb3, Account):
-    def __init__(self, private_key: str, rpc_url: str = None, proxy: str = None):
-        self.web3_provider = AsyncHTTPProvider(
-            endpoint_uri=rpc_url,
-            request_kwargs={
-                "proxy": proxy if proxy else None,
-                "ssl": False
-            }
-        )
+    def __init__(
+            self,
+            private_key: str,
+            rpc_url: str = None,
+            proxy: str = None,
+            services: Web3Services = None,
+            snapshot: WalletSnapshot = None,
+            address: str = None,
+    ):
+        self.services = services or Web3Services()
+        self.snapshot = snapshot
+        self.web3_provider = self.services.create_provider(rpc_url, proxy)
 
         super().__init__(provider=self.web3_provider, modules={"eth": (AsyncEth,)})
-        self.keypair = self.from_key(private_key)
+        self.private_key = private_key
+        # A known address lets the signer service do all key work, the local keypair is then never derived
+        self.address = address
+        self.gap_fills: set[asyncio.Task] = set()
+        self.filling_gaps = False
+
+    @cached_property
+    def keypair(self) -> LocalAccount:
+        return self.from_key(self.private_key)
 
     @property
     def wallet_address(self):
-        return self.keypair.address
+        return self.address or self.keypair.address
 
     @staticmethod
     def _get_checksum_address(address: str) -> ChecksumAddress:
         return AsyncWeb3.to_checksum_address(address)
 
+    @property
+    def fresh_snapshot(self) -> WalletSnapshot | None:
+        # Pre-flight values are only valid until the wallet sends its first transaction
+        if self.snapshot and self.snapshot.is_fresh:
+            return self.snapshot
+        return None
+
+    async def _chain_transactions_count(self) -> Nonce:
+        if self.fresh_snapshot:
+            return Nonce(self.fresh_snapshot.nonce)
+        return await self.eth.get_transaction_count(self.wallet_address)
+
     async def transactions_count(self) -> Nonce:
-        return await self.eth.get_transaction_count(self.keypair.address)
+        if self.services.nonce_manager:
+            return Nonce(await self.services.nonce_manager.reserve(self.wallet_address, self._chain_transactions_count))
+        return await self._chain_transactions_count()
+
+    def release_nonce(self, trx: Any) -> None:
+        if self.services.nonce_manager and "nonce" in trx:
+            self.services.nonce_manager.release(self.wallet_address, trx["nonce"])
+            self._schedule_gap_fill()
+
+    def _schedule_gap_fill(self) -> None:
+        # Later transactions wait in the mempool behind a gap, so it is filled right away
+        # instead of after their receipt waits time out
+        nonce_manager = self.services.nonce_manager
+        if self.filling_gaps or not nonce_manager or not nonce_manager.gaps(self.wallet_address):
+            return
+
+        task = asyncio.create_task(self.fill_nonce_gaps())
+        self.gap_fills.add(task)
+        task.add_done_callback(self.gap_fills.discard)
+
+    async def current_gas_price(self) -> int:
+        gas_oracle = self.services.gas_oracle
+        if gas_oracle and gas_oracle.running and gas_oracle.recommended:
+            return gas_oracle.recommended
+        if self.fresh_snapshot:
+            return self.fresh_snapshot.gas_price
+        if self.services.rpc_cache:
+            return await self.services.rpc_cache.gas_price(self)
+        return await self.eth.gas_price
+
+    async def current_chain_id(self) -> int:
+        if self.snapshot:
+            return self.snapshot.chain_id
+        if self.services.rpc_cache:
+            return await self.services.rpc_cache.chain_id(self)
+        return await self.eth.chain_id
 
     async def check_balance(self) -> None:
-        balance = await self.eth.get_balance(self.keypair.address)
+        balance = await self.eth.get_balance(self.wallet_address)
 
         if balance <= 0:
             raise Exception(f"ETH balance is empty")
 
     async def human_balance(self) -> float:
-        balance = await self.eth.get_balance(self.keypair.address)
+        if self.fresh_snapshot:
+            balance = self.fresh_snapshot.balance
+        else:
+            balance = await self.eth.get_balance(self.wallet_address)
         return float(AsyncWeb3.from_wei(balance, "ether"))
 
     async def _build_base_transaction(self, contract_function) -> TxParams:
-        gas_estimate = await contract_function.estimate_gas({"from": self.keypair.address})
+        gas_estimate = await contract_function.estimate_gas({"from": self.wallet_address})
 
         return {
-            "gasPrice": await self.eth.gas_price,
+            "gasPrice": await self.current_gas_price(),
             "nonce": await self.transactions_count(),
             "gas": int(gas_estimate * 1.2),
         }
@@ -71,12 +143,102 @@ class Web3Wallet(AsyncWeb3, Account):
             return False, str(error)
 
 
+    async def sign(self, trx: Any) -> SignedTransaction:
+        signer = self.services.signer
+        try:
+            if signer and signer.running:
+                return await signer.sign(self.private_key, trx)
+            return self.keypair.sign_transaction(trx)
+        except Exception:
+            self.release_nonce(trx)
+            raise
+
+    async def send_signed_transaction(self, trx: Any, signed: SignedTransaction) -> HexBytes:
+        nonce_manager = self.services.nonce_manager
+
+        try:
+            tx_hash = await self.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as error:
+            if nonce_manager and "nonce too low" in str(error).lower():
+                nonce_manager.resync(self.wallet_address)
+            else:
+                self.release_nonce(trx)
+            raise
+
+        if nonce_manager:
+            nonce_manager.confirm(self.wallet_address, trx["nonce"])
+            self._schedule_gap_fill()
+        self.snapshot = None
+        return tx_hash
+
+    async def broadcast_transaction(self, trx: Any) -> HexBytes:
+        return await self.send_signed_transaction(trx, await self.sign(trx))
+
+    async def wait_for_receipt(self, tx_hash: HexBytes) -> TxReceipt:
+        if self.services.receipt_tracker and self.services.receipt_tracker.running:
+            return await self.services.receipt_tracker.wait(tx_hash)
+        return await self.eth.wait_for_transaction_receipt(tx_hash)
+
+    async def transaction_dropped(self, tx_hash: HexBytes, nonce: int | None) -> bool:
+        """True when the node no longer knows the transaction and its nonce was used by another one"""
+        try:
+            await self.eth.get_transaction(tx_hash)
+            return False
+        except TransactionNotFound:
+            pass
+
+        return nonce is not None and await self.eth.get_transaction_count(self.wallet_address) > nonce
+
     async def send_and_verify_transaction(self, trx: Any) -> tuple[bool | Any, str]:
-        signed = self.keypair.sign_transaction(trx)
-        tx_hash = await self.eth.send_raw_transaction(signed.raw_transaction)
-        receipt = await self.eth.wait_for_transaction_receipt(tx_hash)
+        tx_hash = await self.broadcast_transaction(trx)
+        receipt = await self.wait_for_receipt(tx_hash)
         return receipt["status"] == 1, tx_hash.hex()
 
+    async def fill_nonce_gaps(self) -> int:
+        """Sends zero-value self transfers for released nonces that block later transactions"""
+        nonce_manager = self.services.nonce_manager
+        if not nonce_manager:
+            return 0
+
+        # Failed fills release their nonce again, they are retried by settle_nonces instead of rescheduled
+        self.filling_gaps = True
+        try:
+            return await self._fill_gaps(nonce_manager)
+        finally:
+            self.filling_gaps = False
+
+    async def _fill_gaps(self, nonce_manager: NonceManager) -> int:
+        filled = 0
+        for nonce in nonce_manager.gaps(self.wallet_address):
+            if not nonce_manager.claim(self.wallet_address, nonce):
+                continue
+
+            transaction = {
+                "chainId": await self.current_chain_id(),
+                "from": self.wallet_address,
+                "to": self.wallet_address,
+                "value": 0,
+                "gasPrice": await self.current_gas_price(),
+                "nonce": nonce,
+                "gas": 21000,
+            }
+            try:
+                await self.broadcast_transaction(transaction)
+                filled += 1
+                logger.info(f"Account: {self.wallet_address} | Filled nonce gap {nonce} with a self transfer")
+            except Exception as e:
+                logger.error(f"Account: {self.wallet_address} | Cannot fill nonce gap {nonce}: {e}")
+
+        return filled
+
+    async def settle_nonces(self) -> None:
+        """Waits for gap fills in flight, fills what is left and drops the wallet's nonce state"""
+        if self.gap_fills:
+            await asyncio.gather(*self.gap_fills, return_exceptions=True)
+        await self.fill_nonce_gaps()
+        if self.services.nonce_manager:
+            self.services.nonce_manager.forget(self.wallet_address)
+
     async def cleanup(self):
         try:
             if hasattr(self.web3_provider, "disconnect"):
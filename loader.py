@@ -1,10 +1,148 @@
-import asyncio
+from utils import load_config, AddressCache, RunJournal, FileOperations, ProxyManager, HttpClientManager, RateLimiter, AdaptiveConcurrencyLimiter
+from core.web3.block_watcher import BlockWatcher
+from core.web3.cache import GasLimitCache, QuoteCache, RpcCache
+from core.web3.gas_oracle import GasOracle
+from core.web3.modules.bridge_pipeline import BridgePipeline
+from core.web3.modules.gaszip_encoder import GasZipDepositEncoder
+from core.web3.modules.gaszip_health import GasZipHealthMonitor
+from core.web3.modules.gaszip_router import GasZipEndpointRouter
+from core.web3.nonce_manager import NonceManager
+from core.web3.receipt_tracker import ReceiptTracker
+from core.web3.rpc_router import RpcRouter
+from core.web3.services import Web3Services
+from core.web3.session_pool import RpcSessionPool
+from core.web3.signer import SignerService
 
-from utils import load_config, FileOperations, ProxyManager
-
-config = load_config()
 file_operations = FileOperations()
-semaphore = asyncio.Semaphore(1)
+address_cache = AddressCache(file_operations.state_path / "address_cache.json")
+config = load_config(address_cache)
+file_operations.configure_writer(
+    batch_size=config.result_writer_settings.batch_size,
+    flush_interval=config.result_writer_settings.flush_interval,
+    durability=config.result_writer_settings.durability,
+)
+concurrency_limiter = AdaptiveConcurrencyLimiter(
+    initial=config.concurrency_settings.initial,
+    min_limit=config.concurrency_settings.min,
+    max_limit=config.concurrency_settings.max,
+    increase_step=config.concurrency_settings.increase_step,
+    decrease_factor=config.concurrency_settings.decrease_factor,
+    window_size=config.concurrency_settings.window_size,
+    latency_tolerance=config.concurrency_settings.latency_tolerance,
+)
 
 proxy_manager = ProxyManager(check_uniqueness=True)
 proxy_manager.load_proxy(proxies=config.proxies)
+
+rate_limiter = RateLimiter()
+if config.web3_settings.rpc_rate_limit.enabled:
+    # One bucket per RPC host, so every added provider adds its own throughput
+    for rpc_url in config.web3_settings.rpc_urls:
+        rate_limiter.configure(
+            rpc_url,
+            rate=config.web3_settings.rpc_rate_limit.rate,
+            burst=config.web3_settings.rpc_rate_limit.burst,
+        )
+if config.web3_settings.gaszip_rate_limit.enabled:
+    rate_limiter.configure(
+        GasZipEndpointRouter.API_HOST,
+        rate=config.web3_settings.gaszip_rate_limit.rate,
+        burst=config.web3_settings.gaszip_rate_limit.burst,
+    )
+
+rpc_session_pool = RpcSessionPool(
+    pool_size=config.web3_settings.connection_pool.pool_size,
+    idle_timeout=config.web3_settings.connection_pool.idle_timeout,
+)
+rpc_cache = RpcCache(
+    gas_price_ttl=config.web3_settings.rpc_cache.gas_price_ttl,
+) if config.web3_settings.rpc_cache.enabled else None
+quote_router = GasZipEndpointRouter(
+    state_path=file_operations.state_path / "gaszip_endpoints.json",
+    failure_threshold=config.web3_settings.quote_router.failure_threshold,
+    reset_timeout=config.web3_settings.quote_router.reset_timeout,
+)
+http_clients = HttpClientManager(
+    http2=config.web3_settings.http_client.http2,
+    max_connections=config.web3_settings.http_client.max_connections,
+    max_keepalive_connections=config.web3_settings.http_client.max_keepalive_connections,
+    keepalive_expiry=config.web3_settings.http_client.keepalive_expiry,
+    idle_timeout=config.web3_settings.http_client.idle_timeout,
+    rate_limiter=rate_limiter,
+    observer=concurrency_limiter,
+)
+gaszip_health = GasZipHealthMonitor(
+    proxy=config.proxies[0] if config.proxies else None,
+    interval=config.web3_settings.gaszip_health.interval,
+    retry_interval=config.web3_settings.gaszip_health.retry_interval,
+    max_wait=config.web3_settings.gaszip_health.max_wait,
+    http_clients=http_clients,
+) if config.web3_settings.gaszip_health.enabled else None
+web3_services = Web3Services(
+    session_pool=rpc_session_pool,
+    rpc_cache=rpc_cache,
+    gas_limits=GasLimitCache(
+        safety_margin=config.web3_settings.gas_limit_cache.safety_margin,
+        sample_rate=config.web3_settings.gas_limit_cache.sample_rate,
+        ttl=config.web3_settings.gas_limit_cache.ttl,
+    ) if config.web3_settings.gas_limit_cache.enabled else None,
+    quote_cache=QuoteCache(
+        ttl=config.web3_settings.quote_cache.ttl,
+        verify_rate=config.web3_settings.quote_cache.verify_rate,
+    ) if config.web3_settings.quote_cache.enabled else None,
+    deposit_encoder=GasZipDepositEncoder(
+        short_ids=config.web3_settings.deposit_encoder.short_ids,
+        verify_rate=config.web3_settings.deposit_encoder.verify_rate,
+    ) if config.web3_settings.deposit_encoder.enabled else None,
+    quote_router=quote_router,
+    gaszip_health=gaszip_health,
+    http_clients=http_clients,
+    rate_limiter=rate_limiter,
+    concurrency=concurrency_limiter,
+    nonce_manager=NonceManager(),
+    signer=SignerService(
+        workers=config.web3_settings.signer.workers,
+        batch_size=config.web3_settings.signer.batch_size,
+        batch_window=config.web3_settings.signer.batch_window,
+    ) if config.web3_settings.signer.enabled else None,
+    rpc_router=RpcRouter(
+        urls=config.web3_settings.rpc_urls,
+        failure_threshold=config.web3_settings.rpc_router.failure_threshold,
+        reset_timeout=config.web3_settings.rpc_router.reset_timeout,
+    ),
+)
+block_watcher = BlockWatcher(
+    rpc_url=config.web3_settings.bsc_rpc_url,
+    proxy=config.proxies[0] if config.proxies else None,
+    services=web3_services,
+    poll_interval=config.web3_settings.receipt_tracker.poll_interval,
+)
+if config.web3_settings.gas_oracle.enabled:
+    web3_services.gas_oracle = GasOracle(
+        block_watcher=block_watcher,
+        block_count=config.web3_settings.gas_oracle.block_count,
+        percentile=config.web3_settings.gas_oracle.percentile,
+        burst_percentile=config.web3_settings.gas_oracle.burst_percentile,
+        congestion_ratio=config.web3_settings.gas_oracle.congestion_ratio,
+        min_gas_price=int(config.web3_settings.gas_oracle.min_gas_price_gwei * 10 ** 9),
+        max_gas_price=int(config.web3_settings.gas_oracle.max_gas_price_gwei * 10 ** 9),
+        max_age=config.web3_settings.gas_oracle.max_age,
+    )
+if config.web3_settings.receipt_tracker.enabled:
+    web3_services.receipt_tracker = ReceiptTracker(
+        block_watcher=block_watcher,
+        batch_size=config.web3_settings.receipt_tracker.batch_size,
+        timeout=config.web3_settings.receipt_tracker.timeout,
+    )
+bridge_pipeline = BridgePipeline(
+    quote_workers=config.web3_settings.pipeline.quote_workers,
+    build_workers=config.web3_settings.pipeline.build_workers,
+    sign_workers=config.web3_settings.pipeline.sign_workers,
+    broadcast_workers=config.web3_settings.pipeline.broadcast_workers,
+    confirm_workers=config.web3_settings.pipeline.confirm_workers,
+    queue_size=config.web3_settings.pipeline.queue_size,
+    report_interval=config.web3_settings.pipeline.report_interval,
+) if config.web3_settings.pipeline.enabled else None
+run_journal = RunJournal(
+    file_operations.state_path / "run_journal.sqlite3"
+) if config.web3_settings.run_journal.enabled else None
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from pydantic import BaseModel, PositiveInt, ConfigDict, Field, PositiveFloat
+from dataclasses import dataclass, field
+from typing import Literal, Sequence
+from pydantic import BaseModel, PositiveInt, ConfigDict, Field, PositiveFloat, SkipValidation
 
 from core.web3.wallet import Web3Wallet
 
@@ -30,23 +31,236 @@ class PositiveIntRange:
 @dataclass
 class AttemptsAndDelaySettings:
     delay_before_start: Range
+    schedule_capacity: PositiveInt = 1000
 
 
 
+@dataclass
+class DestinationChain:
+    chain_id: PositiveInt
+    amount: PositiveFloatRange
+    name: str = ""
+
+    @property
+    def label(self) -> str:
+        return self.name or f"chain {self.chain_id}"
+
+
+@dataclass
+class ConnectionPoolSettings:
+    pool_size: PositiveInt = 100
+    idle_timeout: PositiveInt = 60
+
+
+@dataclass
+class PreflightSettings:
+    enabled: bool = True
+    batch_size: PositiveInt = 100
+    max_age: PositiveInt = 300
+
+
+@dataclass
+class BalanceScanSettings:
+    enabled: bool = True
+    batch_size: PositiveInt = 1000
+    gas_limit_reserve: PositiveInt = 100000
+
+
+@dataclass
+class RpcCacheSettings:
+    enabled: bool = True
+    gas_price_ttl: PositiveFloat = 3
+
+
+@dataclass
+class GasLimitCacheSettings:
+    enabled: bool = True
+    safety_margin: PositiveFloat = 1.2
+    sample_rate: float = 0.05
+    ttl: PositiveInt = 600
+
+
+@dataclass
+class QuoteCacheSettings:
+    enabled: bool = True
+    ttl: PositiveInt = 300
+    verify_rate: float = 0.05
+
+
+@dataclass
+class DepositEncoderSettings:
+    enabled: bool = True
+    # GasZip short ids by chain id, 204 is opBNB
+    short_ids: dict[int, int] = field(default_factory=lambda: {204: 58})
+    verify_rate: float = 0.02
+
+
+@dataclass
+class QuoteRouterSettings:
+    failure_threshold: PositiveInt = 3
+    reset_timeout: PositiveInt = 60
+
+
+@dataclass
+class GasZipHealthSettings:
+    enabled: bool = True
+    interval: PositiveInt = 30
+    retry_interval: PositiveInt = 5
+    max_wait: PositiveInt = 300
+
+
+@dataclass
+class ReceiptTrackerSettings:
+    enabled: bool = True
+    poll_interval: PositiveFloat = 1
+    batch_size: PositiveInt = 100
+    timeout: PositiveInt = 120
+
+
+@dataclass
+class PipelineSettings:
+    enabled: bool = True
+    quote_workers: PositiveInt = 10
+    build_workers: PositiveInt = 10
+    sign_workers: PositiveInt = 4
+    broadcast_workers: PositiveInt = 10
+    confirm_workers: PositiveInt = 200
+    queue_size: PositiveInt = 100
+    report_interval: PositiveInt = 30
+
+
+@dataclass
+class SignerSettings:
+    enabled: bool = False
+    workers: PositiveInt | None = None
+    batch_size: PositiveInt = 50
+    batch_window: PositiveFloat = 0.005
+
+
+@dataclass
+class RunJournalSettings:
+    enabled: bool = True
+
+
+@dataclass
+class GasOracleSettings:
+    enabled: bool = True
+    block_count: PositiveInt = 20
+    percentile: PositiveFloat = 50
+    burst_percentile: PositiveFloat = 90
+    congestion_ratio: PositiveFloat = 0.9
+    min_gas_price_gwei: PositiveFloat = 0.05
+    max_gas_price_gwei: PositiveFloat = 10
+    max_age: PositiveInt = 30
+
+
+@dataclass
+class HttpClientSettings:
+    http2: bool = True
+    max_connections: PositiveInt = 100
+    max_keepalive_connections: PositiveInt = 20
+    keepalive_expiry: PositiveInt = 30
+    idle_timeout: PositiveInt = 300
+
+
+@dataclass
+class RateLimitSettings:
+    enabled: bool = True
+    rate: PositiveFloat = 20
+    burst: PositiveInt = 40
+
+
+@dataclass
+class ConcurrencySettings:
+    initial: PositiveInt = 1
+    min: PositiveInt = 1
+    max: PositiveInt = 20
+    increase_step: PositiveInt = 1
+    decrease_factor: PositiveFloat = 0.5
+    window_size: PositiveInt = 20
+    latency_tolerance: PositiveFloat = 2.0
+    queue_size: PositiveInt = 100
+
+
+@dataclass
+class ResultWriterSettings:
+    batch_size: PositiveInt = 100
+    flush_interval: PositiveFloat = 1.0
+    durability: Literal["buffered", "flush", "fsync"] = "flush"
+
+
+@dataclass
+class RpcRouterSettings:
+    failure_threshold: PositiveInt = 3
+    reset_timeout: PositiveInt = 30
+
+
 @dataclass
 class Web3Settings:
     bsc_rpc_url: str
     amount_to_bridge: PositiveFloatRange
+    bsc_rpc_urls: list[str] = field(default_factory=list)
+    destination_chains: list[DestinationChain] = field(default_factory=list)
+    bridges_per_wallet: PositiveInt = 1
+    connection_pool: ConnectionPoolSettings = field(default_factory=ConnectionPoolSettings)
+    preflight: PreflightSettings = field(default_factory=PreflightSettings)
+    balance_scan: BalanceScanSettings = field(default_factory=BalanceScanSettings)
+    rpc_cache: RpcCacheSettings = field(default_factory=RpcCacheSettings)
+    gas_limit_cache: GasLimitCacheSettings = field(default_factory=GasLimitCacheSettings)
+    quote_cache: QuoteCacheSettings = field(default_factory=QuoteCacheSettings)
+    deposit_encoder: DepositEncoderSettings = field(default_factory=DepositEncoderSettings)
+    quote_router: QuoteRouterSettings = field(default_factory=QuoteRouterSettings)
+    gaszip_health: GasZipHealthSettings = field(default_factory=GasZipHealthSettings)
+    http_client: HttpClientSettings = field(default_factory=HttpClientSettings)
+    receipt_tracker: ReceiptTrackerSettings = field(default_factory=ReceiptTrackerSettings)
+    pipeline: PipelineSettings = field(default_factory=PipelineSettings)
+    signer: SignerSettings = field(default_factory=SignerSettings)
+    run_journal: RunJournalSettings = field(default_factory=RunJournalSettings)
+    rpc_router: RpcRouterSettings = field(default_factory=RpcRouterSettings)
+    gas_oracle: GasOracleSettings = field(default_factory=GasOracleSettings)
+    rpc_rate_limit: RateLimitSettings = field(default_factory=RateLimitSettings)
+    gaszip_rate_limit: RateLimitSettings = field(default_factory=lambda: RateLimitSettings(rate=5, burst=10))
+
+    def __post_init__(self):
+        # Fails on load instead of on the first wallet
+        self.share_range
+
+    @property
+    def rpc_urls(self) -> list[str]:
+        # bsc_rpc_url stays the primary endpoint, extra ones are added from bsc_rpc_urls
+        return list(dict.fromkeys([self.bsc_rpc_url, *self.bsc_rpc_urls]))
+
+    @property
+    def destinations(self) -> list[DestinationChain]:
+        # Without destination_chains every wallet bridges amount_to_bridge to opBNB
+        return self.destination_chains or [DestinationChain(chain_id=204, amount=self.amount_to_bridge, name="opBNB")]
+
+    @property
+    def share_range(self) -> PositiveFloatRange:
+        """Amount each destination chain receives, GasZip splits a deposit evenly between its chains"""
+        low = max(destination.amount.min for destination in self.destinations)
+        high = min(destination.amount.max for destination in self.destinations)
+        if low > high:
+            raise ValueError(f"Amount ranges of destination_chains do not overlap, no share fits all chains ({low} > {high})")
+        return PositiveFloatRange(min=low, max=high)
+
+    @property
+    def max_deposit(self) -> float:
+        return self.share_range.max * len(self.destinations)
 
 
 
 
 class Config(BaseConfig):
     target_addresses: list[str] = Field(default_factory=list)
-    wallet_private_keys: list[str] = Field(default_factory=list)  # Loaded from wallets.txt
+    # A KeyStore from wallets.keys or a list from wallets.txt, kept as is so the key store is never copied
+    wallet_private_keys: SkipValidation[Sequence[str]] = Field(default_factory=list)
+    wallet_addresses: SkipValidation[Sequence[str | None]] = Field(default_factory=list)  # Same order, None until derived
     proxies: list[str] = Field(default_factory=list)
 
     web3_settings: Web3Settings
     attempts_and_delay_settings: AttemptsAndDelaySettings
+    concurrency_settings: ConcurrencySettings = Field(default_factory=ConcurrencySettings)
+    result_writer_settings: ResultWriterSettings = Field(default_factory=ResultWriterSettings)
 
     module: str = ""
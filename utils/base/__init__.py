@@ -1,2 +1,5 @@
 from .file_utils import *
 from .load_config import load_config
+from .address_cache import AddressCache
+from .key_store import KeyStore
+from .run_journal import RunJournal
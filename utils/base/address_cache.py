@@ -0,0 +1,88 @@
+import hashlib
+import hmac
+import json
+import os
+import secrets
+
+from pathlib import Path
+
+from loguru import logger
+
+
+class AddressCache:
+    """Maps a salted hash of each private key to its checksum address, no key material is stored
+
+    The cache also remembers which lines of wallets.txt held valid keys, so an unchanged file
+    is not validated again on the next start.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.salt = secrets.token_bytes(16)
+        self.fingerprint: str | None = None
+        self.valid_lines: list[int] = []
+        self.entries: dict[str, str] = {}
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def file_fingerprint(path: str | Path) -> str:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+    def _key_hash(self, private_key: str) -> str:
+        return hmac.new(self.salt, private_key.lower().removeprefix("0x").encode(), hashlib.sha256).hexdigest()[:32]
+
+    def matches(self, fingerprint: str) -> bool:
+        return self.fingerprint == fingerprint
+
+    def set_source(self, fingerprint: str, valid_lines: list[int]) -> None:
+        if not self.matches(fingerprint):
+            self.fingerprint = fingerprint
+            self.valid_lines = valid_lines
+            self.dirty = True
+
+    def lookup(self, private_keys: list[str]) -> list[str | None]:
+        return [self.entries.get(self._key_hash(private_key)) for private_key in private_keys]
+
+    def update(self, private_keys: list[str], addresses: list[str]) -> None:
+        # Rebuilt from the current key list, so keys removed from wallets.txt drop out of the cache
+        entries = {self._key_hash(private_key): address for private_key, address in zip(private_keys, addresses)}
+        if entries != self.entries:
+            self.entries = entries
+            self.dirty = True
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            salt, fingerprint = bytes.fromhex(data["salt"]), data["fingerprint"]
+            valid_lines, entries = list(data["valid_lines"]), dict(data["entries"])
+        except Exception as e:
+            logger.warning(f"Cannot load address cache from {self.path}, it will be rebuilt: {e}")
+            return
+
+        self.salt = salt
+        self.fingerprint = fingerprint
+        self.valid_lines = valid_lines
+        self.entries = entries
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                "salt": self.salt.hex(),
+                "fingerprint": self.fingerprint,
+                "valid_lines": self.valid_lines,
+                "entries": self.entries,
+            }
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(temporary, self.path)
+            self.dirty = False
+        except Exception as e:
+            logger.warning(f"Cannot save address cache to {self.path}: {e}")
@@ -1,15 +1,30 @@
 import asyncio
+import os
+import time
 import aiofiles
 
+from collections import defaultdict
 from pathlib import Path
+from typing import Any
 from loguru import logger
 
 
 
 class FileOperations:
+    BUFFERED = "buffered"
+    FLUSH = "flush"
+    FSYNC = "fsync"
+
     def __init__(self, base_path: str = "./results"):
         self.base_path = Path(base_path)
+        self.state_path = self.base_path / "state"
         self.lock = asyncio.Lock()
+        self.batch_size = 100
+        self.flush_interval = 1.0
+        self.durability = self.FLUSH
+        self.queue: asyncio.Queue[tuple[Path, str] | None] | None = None
+        self.writer: asyncio.Task | None = None
+        self.files: dict[Path, Any] = {}
         self.module_paths: dict[str, dict[str, Path]] = {
             "sender": {
                 "success": self.base_path / "login" / "bridge_success.txt",
@@ -19,6 +34,7 @@ class FileOperations:
 
     async def setup_files(self):
         self.base_path.mkdir(exist_ok=True)
+        self.state_path.mkdir(exist_ok=True)
         for module_name, module_paths in self.module_paths.items():
             for path_key, path in module_paths.items():
                 path.parent.mkdir(parents=True, exist_ok=True)
@@ -27,11 +43,87 @@ class FileOperations:
                 else:
                     path.touch(exist_ok=True)
 
+    def configure_writer(self, batch_size: int = 100, flush_interval: float = 1.0, durability: str = FLUSH) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+
+    async def start_writer(self) -> None:
+        if self.writer:
+            return
+
+        self.queue = asyncio.Queue(maxsize=self.batch_size * 10)
+        self.writer = asyncio.create_task(self._write_batches())
+
+    async def stop_writer(self) -> None:
+        """Writes everything still queued and stops the background writer"""
+        if not self.writer:
+            return
+
+        await self.queue.put(None)
+        await self.writer
+        self.writer = None
+        self.queue = None
+
+        for file in self.files.values():
+            await file.close()
+        self.files.clear()
+
+    async def _write_batches(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._write_batch(batch)
+
+    async def _write_batch(self, batch: list[tuple[Path, str]]) -> None:
+        lines_by_path: dict[Path, list[str]] = defaultdict(list)
+        for file_path, line in batch:
+            lines_by_path[file_path].append(line)
+
+        for file_path, lines in lines_by_path.items():
+            try:
+                # Result files stay open while the writer runs, buffered mode leaves flushing to the OS buffer size
+                file = self.files.get(file_path)
+                if file is None:
+                    file = self.files[file_path] = await aiofiles.open(file_path, "a")
+
+                await file.write("".join(f"{line}\n" for line in lines))
+                if self.durability != self.BUFFERED:
+                    await file.flush()
+                if self.durability == self.FSYNC:
+                    await asyncio.to_thread(os.fsync, file.fileno())
+            except IOError as e:
+                logger.error(f"Error writing {len(lines)} results to {file_path} (IOError): {e}")
+            except Exception as e:
+                logger.error(f"Error writing {len(lines)} results to {file_path}: {e}")
+
     async def export_result(self, result: str, status: bool, module: str):
         if module not in self.module_paths:
             raise ValueError(f"Unknown module: {module}")
 
         file_path = self.module_paths[module]["success" if status else "failed"]
+        if self.writer:
+            await self.queue.put((file_path, result))
+            return
+
         async with self.lock:
             try:
                 async with aiofiles.open(file_path, "a") as file:
@@ -0,0 +1,144 @@
+import mmap
+import os
+
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from eth_account import Account
+from eth_utils import to_checksum_address
+from loguru import logger
+
+
+class KeyStoreAddresses(Sequence[str]):
+    """Wallet addresses of a key store, read from the same records as the keys"""
+
+    def __init__(self, key_store: "KeyStore"):
+        self.key_store = key_store
+
+    def __len__(self) -> int:
+        return len(self.key_store)
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self.key_store.address(i) for i in range(*index.indices(len(self.key_store)))]
+        return self.key_store.address(index)
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self.key_store)):
+            yield self.key_store.address(index)
+
+
+class KeyStore(Sequence[str]):
+    """Private keys and their addresses packed as 52-byte records in a memory-mapped file
+
+    Opening the store is O(1) whatever the number of keys. Addresses are derived once on import,
+    and a key or address only becomes a Python string while it is being used.
+    """
+
+    MAGIC = b"GZKS\x02\x00\x00\x00"
+    KEY_SIZE = 32
+    ADDRESS_SIZE = 20
+    RECORD_SIZE = KEY_SIZE + ADDRESS_SIZE
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.file = open(self.path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.map[:4] == self.MAGIC[:4] and self.map[:len(self.MAGIC)] != self.MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} was written by an older version, import the wallets again")
+        if self.map[:len(self.MAGIC)] != self.MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a wallet key store")
+        if (len(self.map) - len(self.MAGIC)) % self.RECORD_SIZE:
+            self.close()
+            raise ValueError(f"{self.path} is truncated, import the wallets again")
+
+        self.count = (len(self.map) - len(self.MAGIC)) // self.RECORD_SIZE
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _offset(self, index: int) -> int:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("key store index out of range")
+
+        return len(self.MAGIC) + index * self.RECORD_SIZE
+
+    def key_bytes(self, index: int) -> bytes:
+        offset = self._offset(index)
+        return self.map[offset:offset + self.KEY_SIZE]
+
+    def address(self, index: int) -> str:
+        offset = self._offset(index) + self.KEY_SIZE
+        return to_checksum_address(self.map[offset:offset + self.ADDRESS_SIZE])
+
+    @property
+    def addresses(self) -> KeyStoreAddresses:
+        return KeyStoreAddresses(self)
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self.key_bytes(i).hex() for i in range(*index.indices(self.count))]
+        return self.key_bytes(index).hex()
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self.count):
+            yield self.key_bytes(index).hex()
+
+    def fingerprint(self) -> str:
+        stat = self.path.stat()
+        return f"keystore:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def close(self) -> None:
+        self.map.close()
+        self.file.close()
+
+    @classmethod
+    def import_text(cls, source: str | Path, target: str | Path) -> int:
+        """Streams wallets.txt into a key store, invalid lines are skipped like in the text loader
+
+        Addresses are derived here once, so later starts never derive or hash the keys.
+        """
+        source, target = Path(source), Path(target)
+        temporary = target.with_suffix(".tmp")
+        imported = 0
+
+        with open(source, "r", encoding="utf-8") as lines, open(temporary, "wb") as output:
+            output.write(cls.MAGIC)
+            for number, line in enumerate(lines, start=1):
+                line = line.strip().removeprefix("0x")
+                if not line or line.startswith("#"):
+                    continue
+
+                try:
+                    record = bytes.fromhex(line)
+                except ValueError:
+                    logger.warning(f"Invalid hex format at line {number}: {line[:10]}...")
+                    continue
+
+                if len(record) != cls.KEY_SIZE:
+                    logger.warning(f"Invalid private key length at line {number}: {line[:10]}... (expected 64 characters)")
+                    continue
+
+                try:
+                    address = bytes.fromhex(Account.from_key(record).address[2:])
+                except Exception as e:
+                    logger.warning(f"Invalid private key at line {number}: {line[:10]}... | Error: {e}")
+                    continue
+
+                output.write(record + address)
+                imported += 1
+
+        if not imported:
+            # An empty store would replace wallets.txt and stop every start
+            temporary.unlink()
+            logger.error(f"No valid private keys in {source}, the key store was not written")
+            return 0
+
+        os.replace(temporary, target)
+        logger.success(f"Imported {imported} wallet keys from {source} into {target}")
+        return imported
@@ -8,6 +8,8 @@ from loguru import logger
 from better_proxy import Proxy
 
 from models import Config
+from utils.base.address_cache import AddressCache
+from utils.base.key_store import KeyStore
 from sys import exit
 
 
@@ -23,8 +25,9 @@ class ConfigLoader:
         }
     )
 
-    def __init__(self, base_path: Union[str, Path] = None):
+    def __init__(self, base_path: Union[str, Path] = None, address_cache: AddressCache = None):
         self.base_path = Path(base_path or os.getcwd())
+        self.address_cache = address_cache
         self.config_path = self.base_path / "config"
         self.data_path = self.config_path / "data"
         self.settings_path = self.config_path / "settings.yaml"
@@ -103,14 +106,42 @@ class ConfigLoader:
         except Exception as e:
             raise ConfigurationError(f"Failed to process accounts file: {str(e)} | File: {filename}")
 
+    def _load_key_store(self) -> Optional[KeyStore]:
+        """Open config/data/wallets.keys if it was imported, it replaces wallets.txt"""
+        key_store_path = self.data_path / "wallets.keys"
+        if not key_store_path.exists():
+            return None
+
+        try:
+            key_store = KeyStore(key_store_path)
+        except Exception as e:
+            raise ConfigurationError(f"Failed to open wallet key store: {e}")
+
+        if not len(key_store):
+            raise ConfigurationError(f"Wallet key store is empty: {key_store_path}")
+
+        wallets_path = self.data_path / "wallets.txt"
+        if wallets_path.exists() and wallets_path.stat().st_mtime > key_store_path.stat().st_mtime:
+            logger.warning("wallets.txt changed after the key store was imported, import it again to use the new keys")
+
+        logger.info(f"Loaded {len(key_store)} wallets from key store {key_store_path}")
+        return key_store
+
     def _parse_wallets(self) -> List[str]:
         """Parse wallet private keys from wallets.txt file"""
         try:
+            wallets_path = self.data_path / "wallets.txt"
             wallet_lines = self._read_file(
-                self.data_path / "wallets.txt", allow_empty=False
+                wallets_path, allow_empty=False
             )
-            
+
+            fingerprint = AddressCache.file_fingerprint(wallets_path) if self.address_cache else None
+            if self.address_cache and self.address_cache.matches(fingerprint):
+                # The file is unchanged since the last run, its keys were already validated
+                return [wallet_lines[i].removeprefix('0x') for i in self.address_cache.valid_lines]
+
             wallets = []
+            valid_lines = []
             for i, line in enumerate(wallet_lines):
                 try:
                     line = line.strip()
@@ -134,6 +165,7 @@ class ConfigLoader:
                         continue
                     
                     wallets.append(line)
+                    valid_lines.append(i)
                     
                 except Exception as e:
                     logger.warning(f"Invalid wallet format at line {i+1}: {line} | Error: {e}")
@@ -145,7 +177,9 @@ class ConfigLoader:
                     "Please add at least one private key to proceed. "
                     "Each private key should be 64 hex characters (with or without 0x prefix)."
                 )
-                
+
+            if self.address_cache:
+                self.address_cache.set_source(fingerprint, valid_lines)
             return wallets
             
         except ConfigurationError:
@@ -160,7 +194,7 @@ class ConfigLoader:
             target_addresses = list(self._parse_accounts("target_addresses.txt"))
             if not target_addresses:
                 logger.warning("No target addresses found in target_addresses.txt - this is fine for BNB bridging")
-            wallet_private_keys = self._parse_wallets()
+            wallet_private_keys = self._load_key_store() or self._parse_wallets()
 
             # Validate wallet configuration
             if len(wallet_private_keys) < 1:
@@ -168,10 +202,18 @@ class ConfigLoader:
                     "Configuration error: You need at least one wallet private key in wallets.txt"
                 )
 
+            if isinstance(wallet_private_keys, KeyStore):
+                # Stored next to the keys, read by index without touching the other wallets
+                wallet_addresses = wallet_private_keys.addresses
+            else:
+                # Addresses missing from the cache stay None until the bot derives them
+                wallet_addresses = self.address_cache.lookup(wallet_private_keys) if self.address_cache else []
+
             return Config(
                 **params,
                 target_addresses=target_addresses,
                 wallet_private_keys=wallet_private_keys,
+                wallet_addresses=wallet_addresses,
                 proxies=proxies,
             )
 
@@ -180,5 +222,5 @@ class ConfigLoader:
             exit(1)
 
 
-def load_config() -> Config:
-    return ConfigLoader().load()
+def load_config(address_cache: AddressCache = None) -> Config:
+    return ConfigLoader(address_cache=address_cache).load()
@@ -0,0 +1,106 @@
+import sqlite3
+import time
+
+from pathlib import Path
+
+from loguru import logger
+
+
+class RunJournal:
+    """SQLite (WAL) record of every bridge: wallet address, stage, tx hash and final status
+
+    Rows are keyed by (address, bridge number), so a resumed run checks a wallet with one
+    indexed lookup and finds transactions that were broadcast but never confirmed.
+    """
+
+    STARTED = "started"
+    BROADCAST = "broadcast"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bridges (
+                address TEXT NOT NULL,
+                bridge INTEGER NOT NULL,
+                wallet_index INTEGER,
+                amount REAL,
+                stage TEXT NOT NULL,
+                tx_hash TEXT,
+                nonce INTEGER,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (address, bridge)
+            )
+            """
+        )
+        columns = {row["name"] for row in self.connection.execute("PRAGMA table_info(bridges)")}
+        if "nonce" not in columns:
+            # Journals written before the nonce was recorded
+            self.connection.execute("ALTER TABLE bridges ADD COLUMN nonce INTEGER")
+
+    def reset(self) -> None:
+        self.connection.execute("DELETE FROM bridges")
+
+    def get(self, address: str, bridge: int) -> sqlite3.Row | None:
+        return self.connection.execute(
+            "SELECT * FROM bridges WHERE address = ? AND bridge = ?", (address, bridge)
+        ).fetchone()
+
+    def completed(self, address: str, bridges: int) -> bool:
+        confirmed = self.connection.execute(
+            "SELECT COUNT(*) FROM bridges WHERE address = ? AND bridge < ? AND stage = ?",
+            (address, bridges, self.CONFIRMED)
+        ).fetchone()[0]
+        return confirmed >= bridges
+
+    def broadcast(self, address: str) -> bool:
+        """True when a bridge of the wallet was broadcast in a previous run and still waits for its receipt"""
+        return self.connection.execute(
+            "SELECT 1 FROM bridges WHERE address = ? AND stage = ? LIMIT 1", (address, self.BROADCAST)
+        ).fetchone() is not None
+
+    def record(
+            self,
+            address: str,
+            bridge: int,
+            stage: str,
+            wallet_index: int = None,
+            amount: float = None,
+            tx_hash: str = None,
+            nonce: int = None,
+            error: str = None,
+    ) -> None:
+        try:
+            # Fields that are not passed keep their previous value, a confirmation keeps the broadcast tx hash
+            self.connection.execute(
+                """
+                INSERT INTO bridges (address, bridge, wallet_index, amount, stage, tx_hash, nonce, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (address, bridge) DO UPDATE SET
+                    wallet_index = COALESCE(excluded.wallet_index, wallet_index),
+                    amount = COALESCE(excluded.amount, amount),
+                    stage = excluded.stage,
+                    tx_hash = COALESCE(excluded.tx_hash, tx_hash),
+                    nonce = COALESCE(excluded.nonce, nonce),
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+                """,
+                (address, bridge, wallet_index, amount, stage, tx_hash, nonce, error, time.time())
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Cannot write run journal entry for {address} bridge {bridge}: {e}")
+
+    def stats(self) -> dict[str, int]:
+        rows = self.connection.execute("SELECT stage, COUNT(*) FROM bridges GROUP BY stage").fetchall()
+        return {stage: count for stage, count in rows}
+
+    def close(self) -> None:
+        self.connection.close()
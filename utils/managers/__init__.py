@@ -1 +1,4 @@
 from .proxy_manager import ProxyManager
+from .http_client_manager import HttpClientManager
+from .rate_limiter import RateLimiter
+from .concurrency_limiter import AdaptiveConcurrencyLimiter
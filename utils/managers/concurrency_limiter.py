@@ -0,0 +1,144 @@
+import asyncio
+
+from collections import deque
+
+from loguru import logger
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight work driven by observed upstream latency and errors
+
+    The limit grows by ``increase_step`` after every healthy window of latency samples and is
+    multiplied by ``decrease_factor`` when a window contains timeouts, throttling responses or
+    a p95 latency above ``latency_tolerance`` times the healthy baseline.
+    """
+
+    TIMEOUT = "timeout"
+    THROTTLED = "throttled"
+
+    def __init__(
+            self,
+            initial: int = 1,
+            min_limit: int = 1,
+            max_limit: int = 20,
+            increase_step: int = 1,
+            decrease_factor: float = 0.5,
+            window_size: int = 20,
+            latency_tolerance: float = 2.0,
+            latency_floor: float = 0.1,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = max(min_limit, min(initial, max_limit))
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.window_size = window_size
+        self.latency_tolerance = latency_tolerance
+        # Jitter on very fast upstreams should not count as rising latency
+        self.latency_floor = latency_floor
+
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.latencies: list[float] = []
+        self.errors: dict[str, int] = {}
+        self.baseline_p95: float | None = None
+        self.last_p95: float | None = None
+        self.recently_decreased = False
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.limit and not self.waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted right before cancellation, hand it to the next waiter
+                self.release()
+            elif future in self.waiters:
+                self.waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def _wake_waiters(self) -> None:
+        while self.waiters and self.in_flight < self.limit:
+            future = self.waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(True)
+
+    def record(self, latency: float | None = None, error: str = None) -> None:
+        if latency is not None:
+            self.latencies.append(latency)
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+        # Errors cut the limit right away, but only once until a full window has been observed again
+        if error and not self.recently_decreased:
+            self._adjust()
+        elif len(self.latencies) >= self.window_size:
+            self._adjust()
+
+    def _p95(self) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def _adjust(self) -> None:
+        p95 = self._p95()
+        errors = dict(self.errors)
+        self.latencies.clear()
+        self.errors.clear()
+        self.last_p95 = p95
+
+        latency_rising = (
+            p95 is not None
+            and self.baseline_p95 is not None
+            and p95 > max(self.baseline_p95 * self.latency_tolerance, self.baseline_p95 + self.latency_floor)
+        )
+        previous = self.limit
+
+        if errors or latency_rising:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        else:
+            if p95 is not None:
+                self.baseline_p95 = p95 if self.baseline_p95 is None else self.baseline_p95 * 0.8 + p95 * 0.2
+            self.limit = min(self.max_limit, self.limit + self.increase_step)
+
+        self.recently_decreased = self.limit < previous
+        p95_text = f"{p95:.3f}s" if p95 is not None else "n/a"
+        baseline_text = f"{self.baseline_p95:.3f}s" if self.baseline_p95 is not None else "n/a"
+        if self.limit < previous:
+            logger.warning(
+                f"Concurrency limit {previous} -> {self.limit} | p95: {p95_text} | baseline p95: {baseline_text} "
+                f"| errors: {errors or 'none'} | in flight: {self.in_flight}"
+            )
+        elif self.limit > previous:
+            logger.info(
+                f"Concurrency limit {previous} -> {self.limit} | p95: {p95_text} | baseline p95: {baseline_text} "
+                f"| in flight: {self.in_flight}"
+            )
+            self._wake_waiters()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self.waiters),
+            "last_p95": self.last_p95,
+            "baseline_p95": self.baseline_p95,
+        }
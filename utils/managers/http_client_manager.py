@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+from httpx import AsyncBaseTransport, AsyncClient, AsyncHTTPTransport, Limits, Request, Response, TimeoutException
+from loguru import logger
+
+from .concurrency_limiter import AdaptiveConcurrencyLimiter
+from .rate_limiter import RateLimiter
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class ObservedTransport(AsyncBaseTransport):
+    """Reports request latency, timeouts and 429 responses to a concurrency limiter"""
+
+    def __init__(self, transport: AsyncBaseTransport, observer: AdaptiveConcurrencyLimiter):
+        self.transport = transport
+        self.observer = observer
+
+    async def handle_async_request(self, request: Request) -> Response:
+        started = time.monotonic()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except TimeoutException:
+            self.observer.record(error=AdaptiveConcurrencyLimiter.TIMEOUT)
+            raise
+
+        if response.status_code == 429:
+            self.observer.record(error=AdaptiveConcurrencyLimiter.THROTTLED)
+        else:
+            self.observer.record(latency=time.monotonic() - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class HttpClientManager:
+    """Long-lived httpx clients per proxy that callers borrow instead of opening their own"""
+
+    def __init__(
+            self,
+            http2: bool = True,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30,
+            idle_timeout: float = 300,
+            timeout: float = 15,
+            rate_limiter: RateLimiter = None,
+            observer: AdaptiveConcurrencyLimiter = None,
+    ):
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requires the 'h2' package (pip install httpx[http2]), falling back to HTTP/1.1")
+            http2 = False
+
+        self.http2 = http2
+        self.limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.observer = observer
+        self.lock = asyncio.Lock()
+        self.clients: dict[str | None, AsyncClient] = {}
+        self.last_used: dict[str | None, float] = {}
+        self.requests = 0
+        self.new_connections = 0
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.new_connections += 1
+
+    async def _on_request(self, request: Request) -> None:
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(str(request.url))
+
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    def _create_client(self, proxy: str | None) -> AsyncClient:
+        transport = AsyncHTTPTransport(http2=self.http2, limits=self.limits, proxy=proxy)
+        if self.observer:
+            transport = ObservedTransport(transport, self.observer)
+
+        return AsyncClient(
+            transport=transport,
+            timeout=self.timeout,
+            event_hooks={"request": [self._on_request]},
+        )
+
+    async def _evict_idle(self, now: float) -> None:
+        for proxy, last_used in list(self.last_used.items()):
+            if now - last_used < self.idle_timeout:
+                continue
+
+            client = self.clients.pop(proxy, None)
+            self.last_used.pop(proxy, None)
+            if client and not client.is_closed:
+                await client.aclose()
+                logger.debug(f"Closed idle HTTP client | Proxy: {proxy}")
+
+    async def get_client(self, proxy: str = None) -> AsyncClient:
+        key = proxy or None
+
+        async with self.lock:
+            now = time.monotonic()
+            await self._evict_idle(now)
+
+            client = self.clients.get(key)
+            if client is None or client.is_closed:
+                client = self._create_client(key)
+                self.clients[key] = client
+
+            self.last_used[key] = now
+            return client
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "clients": len(self.clients),
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": max(self.requests - self.new_connections, 0),
+        }
+
+    async def close(self) -> None:
+        async with self.lock:
+            for client in self.clients.values():
+                if not client.is_closed:
+                    await client.aclose()
+
+            if self.clients:
+                logger.info(f"Closed {len(self.clients)} pooled HTTP clients | Stats: {self.stats()}")
+
+            self.clients.clear()
+            self.last_used.clear()
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.waited = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, cost: float = 1) -> None:
+        async with self.lock:
+            self._refill()
+            # Tokens are reserved up front and may go negative, later callers wait for the debt to refill
+            self.tokens -= cost
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if delay > 0:
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """Token bucket per upstream host"""
+
+    def __init__(self):
+        self.buckets: dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(str(url)).hostname or str(url)
+
+    def configure(self, url: str, rate: float, burst: int) -> None:
+        self.buckets[self._host(url)] = TokenBucket(rate, burst)
+
+    async def acquire(self, url: str, cost: float = 1) -> None:
+        bucket = self.buckets.get(self._host(url))
+        if bucket:
+            await bucket.acquire(cost)
+
+    def stats(self) -> dict[str, float]:
+        return {host: round(bucket.waited, 2) for host, bucket in self.buckets.items()}
@@ -1 +1,4 @@
 from .progress import *
+from .worker_pool import WorkerPool
+from .delay_scheduler import DelayScheduler
+from .pipeline import Pipeline, Stage
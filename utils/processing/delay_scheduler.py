@@ -0,0 +1,71 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable
+
+
+class DelayScheduler:
+    """Heap of jobs ordered by start time, each job is released only once its delay has passed
+
+    The start time is fixed when a job is read from the source (read time + delay), so waiting
+    jobs sit in the heap instead of occupying a worker. At most ``capacity`` jobs are scheduled
+    ahead, the source is read further whenever no job is due.
+    """
+
+    def __init__(self, delay: Callable[[Any], float], capacity: int = 1000):
+        self.delay = delay
+        self.capacity = capacity
+        self.heap: list[tuple[float, int, Any]] = []
+        self.counter = itertools.count()
+        self.released = 0
+        self.late = 0.0
+
+    @staticmethod
+    async def _iterate(jobs: Iterable | AsyncIterable) -> AsyncIterator:
+        if isinstance(jobs, AsyncIterable):
+            async for job in jobs:
+                yield job
+        else:
+            for job in jobs:
+                yield job
+
+    def _due(self) -> bool:
+        return bool(self.heap) and self.heap[0][0] <= time.monotonic()
+
+    def push(self, job: Any) -> None:
+        heapq.heappush(self.heap, (time.monotonic() + self.delay(job), next(self.counter), job))
+
+    async def schedule(self, jobs: Iterable | AsyncIterable) -> AsyncIterator:
+        source = self._iterate(jobs)
+        exhausted = False
+
+        while True:
+            # Due jobs go out first, a source that fetches in chunks does not hold them back
+            while not exhausted and len(self.heap) < self.capacity and not self._due():
+                try:
+                    self.push(await anext(source))
+                except StopAsyncIteration:
+                    exhausted = True
+
+            if not self.heap:
+                return
+
+            start_at = self.heap[0][0]
+            wait = start_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            _, _, job = heapq.heappop(self.heap)
+            self.released += 1
+            self.late -= wait
+            yield job
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "scheduled": len(self.heap),
+            "released": self.released,
+            "average_lateness": round(self.late / self.released, 3) if self.released else 0.0,
+        }
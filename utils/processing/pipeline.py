@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+
+class Stage:
+    """One pipeline step with its own bounded queue, worker count and latency samples"""
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[Any]], workers: int = 1, queue_size: int = 100):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue: asyncio.Queue[tuple[Any, asyncio.Future]] = asyncio.Queue(maxsize=queue_size)
+        self.latencies: deque[float] = deque(maxlen=200)
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+
+    def stats(self) -> dict:
+        ordered = sorted(self.latencies)
+        return {
+            "queued": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "avg": round(sum(ordered) / len(ordered), 3) if ordered else None,
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3) if ordered else None,
+        }
+
+
+class Pipeline:
+    """Jobs pass through the stages in order, each handler returns the job for the next stage
+
+    A job that fails in any stage leaves the pipeline and its submitter gets the exception.
+    """
+
+    def __init__(self, stages: list[Stage], report_interval: float = 30):
+        self.stages = stages
+        self.report_interval = report_interval
+        self.tasks: list[asyncio.Task] = []
+
+    async def submit(self, job: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        await self.stages[0].queue.put((job, future))
+        return await future
+
+    async def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        while True:
+            job, future = await stage.queue.get()
+            stage.in_flight += 1
+            started = time.monotonic()
+            try:
+                job = await stage.handler(job)
+            except Exception as e:
+                stage.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            finally:
+                stage.in_flight -= 1
+                stage.latencies.append(time.monotonic() - started)
+
+            stage.processed += 1
+            if index + 1 < len(self.stages):
+                # Blocks while the next stage is saturated, so backpressure reaches the submitters
+                await self.stages[index + 1].queue.put((job, future))
+            elif not future.done():
+                future.set_result(job)
+
+    def stats(self) -> dict[str, dict]:
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def describe(self) -> str:
+        parts = []
+        for name, stats in self.stats().items():
+            p95 = f"{stats['p95']}s" if stats["p95"] is not None else "n/a"
+            parts.append(f"{name}: queued {stats['queued']}, in flight {stats['in_flight']}, p95 {p95}")
+        return " | ".join(parts)
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            if any(stage.in_flight or not stage.queue.empty() for stage in self.stages):
+                logger.info(f"Pipeline | {self.describe()}")
+
+    @property
+    def running(self) -> bool:
+        return bool(self.tasks)
+
+    async def start(self) -> None:
+        if self.tasks:
+            return
+
+        for index, stage in enumerate(self.stages):
+            self.tasks.extend(asyncio.create_task(self._work(index)) for _ in range(stage.workers))
+        if self.report_interval:
+            self.tasks.append(asyncio.create_task(self._report()))
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
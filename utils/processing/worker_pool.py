@@ -0,0 +1,57 @@
+import asyncio
+
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
+
+from loguru import logger
+
+
+class WorkerPool:
+    """Fixed number of workers draining a bounded queue that is fed lazily from an iterator
+
+    Only ``queue_size`` jobs plus one per worker exist at any time, so memory stays flat no matter
+    how many jobs the iterator yields.
+    """
+
+    def __init__(self, workers: int, queue_size: int = None):
+        self.workers = workers
+        self.queue_size = queue_size or workers * 2
+        self.processed = 0
+        self.failed = 0
+
+    async def _produce(self, jobs: Iterable | AsyncIterable, queue: asyncio.Queue) -> None:
+        try:
+            if isinstance(jobs, AsyncIterable):
+                async for job in jobs:
+                    await queue.put(job)
+            else:
+                for job in jobs:
+                    await queue.put(job)
+        finally:
+            for _ in range(self.workers):
+                await queue.put(None)
+
+    async def _work(self, queue: asyncio.Queue, handler: Callable[[Any], Awaitable[Any]]) -> None:
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+
+            try:
+                await handler(job)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Worker job failed: {e}")
+
+    async def run(self, jobs: Iterable | AsyncIterable, handler: Callable[[Any], Awaitable[Any]]) -> None:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        workers = [asyncio.create_task(self._work(queue, handler)) for _ in range(self.workers)]
+
+        try:
+            await asyncio.gather(self._produce(jobs, queue), *workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    def stats(self) -> dict[str, int]:
+        return {"workers": self.workers, "processed": self.processed, "failed": self.failed}